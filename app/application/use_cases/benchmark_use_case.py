@@ -1,13 +1,45 @@
 # application/use_cases/benchmark_use_case.py
 
+import asyncio
 import logging
+import os
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, List, Optional
+from itertools import islice
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
 from domain.model.entities.benchmark import BenchmarkConfig, BenchmarkEntry, BenchmarkMetrics, BenchmarkResult
 from domain.services.benchmark_service import BenchmarkService
 
 logger = logging.getLogger(__name__)
 
+# Spellings of a confirmed verification status, matched without lowercasing each one
+CONFIRMED_STATUSES = frozenset({"confirmed", "CONFIRMED", "Confirmed"})
+
+# Benchmark service owned by a worker process when entries run in a process pool
+_worker_service: Optional[BenchmarkService] = None
+
+def _init_worker(model_name: str) -> None:
+    """Loads the benchmark service once per worker process.
+    
+    Args:
+        model_name: Identifier for the ML model to benchmark
+    """
+    global _worker_service
+    _worker_service = BenchmarkService(model_name)
+
+def _run_batch(config: BenchmarkConfig, batch_data: List[Dict]) -> List[Optional[List[Dict]]]:
+    """Executes the pipeline for a batch of entries inside a worker process.
+    
+    Args:
+        config: Benchmark configuration parameters
+        batch_data: Input data of each entry in the batch
+        
+    Returns:
+        Pipeline results per entry, None where execution failed
+    """
+    return _worker_service.execute_pipeline_batch(config, batch_data)
+
 class BenchmarkUseCase:
     """
     Coordinates the benchmarking process for evaluating pipeline performance.
@@ -18,83 +50,235 @@ class BenchmarkUseCase:
     - Calculates performance metrics based on results
     """
     
-    def __init__(self, model_name: str):
+    def __init__(self, model_name: str, concurrency: int = 8, use_processes: bool = False,
+                 batch_size: int = 16):
         """Initializes the use case with required services.
         
         Args:
             model_name: Identifier for the ML model to benchmark
+            concurrency: Maximum number of batches processed at the same time. In
+                         threads they share one model, whose calls run one at
+                         a time; the overlap is with parsing and scoring
+            use_processes: Run entries in worker processes instead of threads.
+                           Each worker loads its own copy of the model, which
+                           sidesteps the GIL for CPU-bound pipelines.
+            batch_size: Number of entries that advance through the pipeline
+                        together, sharing batched LLM calls
         """
-        self.benchmark_service = BenchmarkService(model_name)
+        self.model_name = model_name
+        self.concurrency = concurrency
+        self.use_processes = use_processes
+        self.batch_size = batch_size
+        # Worker processes load their own service, so skip loading the model here
+        self.benchmark_service = None if use_processes else BenchmarkService(model_name)
+        # Set at the start of each run to timestamp its results
+        self.run_started_at: Optional[datetime] = None
+        self.run_clock_start_ns = 0
+        # Position of the verify step in pipeline responses, fixed by the run's config
+        self.verify_step_index: Optional[int] = None
 
-    def run_benchmark(self, config: BenchmarkConfig, entries: List[BenchmarkEntry]) -> BenchmarkMetrics:
+    def run_benchmark(self, config: BenchmarkConfig, entries: Iterable[BenchmarkEntry],
+                      on_misclassified: Optional[Callable[[BenchmarkResult], None]] = None) -> BenchmarkMetrics:
         """Executes the full benchmarking workflow.
         
         Args:
             config: Benchmark configuration parameters
-            entries: List of input entries with expected labels
+            entries: Input entries with expected labels. May be a lazy iterable;
+                     it is consumed only as fast as entries are processed.
+            on_misclassified: Optional callback receiving each misclassified case
+                              as soon as it is found. When given, the cases are
+                              handed off instead of kept in the returned metrics.
             
         Returns:
             BenchmarkMetrics: Calculated performance metrics
         """
-        results = []
+        return asyncio.run(self._run_async(config, entries, on_misclassified))
+
+    async def _run_async(self, config: BenchmarkConfig, entries: Iterable[BenchmarkEntry],
+                         on_misclassified: Optional[Callable[[BenchmarkResult], None]] = None) -> BenchmarkMetrics:
+        """Runs batches of entries concurrently, bounded by the configured concurrency.
         
-        # Process each benchmark entry through the pipeline
-        for entry in entries:
-            logger.debug(f"Running pipeline for entry: {entry.input_data}")
-            
-            # Execute pipeline and get response
-            pipeline_response = self.benchmark_service.execute_pipeline_for_entry(config, entry.input_data)
-            logger.debug(pipeline_response)
+        Args:
+            config: Benchmark configuration parameters
+            entries: Input entries with expected labels
+            on_misclassified: Optional callback receiving each misclassified case
             
-            # Extract prediction from pipeline response
-            prediction = self._process_prediction(pipeline_response, entry)
-            if prediction:
-                results.append(prediction)
+        Returns:
+            BenchmarkMetrics: Calculated performance metrics
+        """
+        # Results carry offsets from a single wall-clock reading of the run start
+        self.run_started_at = datetime.now()
+        self.run_clock_start_ns = time.monotonic_ns()
+        # Responses list one result per configured step, in order
+        self.verify_step_index = next(
+            (index for index, step in enumerate(config.pipeline_steps) if step.type == "verify"),
+            None
+        )
+        semaphore = asyncio.Semaphore(self.concurrency)
+        confusion_matrix = BenchmarkService.create_confusion_matrix()
+        misclassified: List[BenchmarkResult] = []
+        # Callbacks run on the event loop thread, one batch at a time, so no lock is needed
+        record_misclassified = on_misclassified or misclassified.append
+        entries = iter(entries)
+        # Only in-flight batches are tracked; finished ones drop out of the set
+        tasks = set()
+        with self._create_executor() as executor:
+            while True:
+                # Claim a slot before pulling the next batch so lazy iterables
+                # are never read further ahead than the work in flight
+                await semaphore.acquire()
+                batch = list(islice(entries, self.batch_size))
+                if not batch:
+                    semaphore.release()
+                    break
+                task = asyncio.create_task(self._process_batch(
+                    config, batch, semaphore, executor, confusion_matrix, record_misclassified
+                ))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            await asyncio.gather(*tasks)
 
         # Calculate final performance metrics
-        return self.benchmark_service.calculate_metrics(results, config.label_value)
+        return BenchmarkService.calculate_metrics(confusion_matrix, misclassified)
+
+    def _create_executor(self) -> Executor:
+        """Builds the executor that runs the synchronous pipeline calls.
+        
+        Returns:
+            Executor: Process pool with one service per worker, or a thread pool
+                      sharing this use case's service
+        """
+        if self.use_processes:
+            return ProcessPoolExecutor(
+                max_workers=min(self.concurrency, os.cpu_count() or 1),
+                initializer=_init_worker,
+                initargs=(self.model_name,)
+            )
+        return ThreadPoolExecutor(max_workers=self.concurrency)
+
+    async def _process_batch(self, config: BenchmarkConfig, batch: List[BenchmarkEntry],
+                             semaphore: asyncio.Semaphore, executor: Executor,
+                             confusion_matrix: List[int],
+                             record_misclassified: Callable[[BenchmarkResult], None]) -> None:
+        """Runs the pipeline for a batch of entries in an already claimed concurrency slot.
+        
+        Args:
+            config: Benchmark configuration parameters
+            batch: Input entries with expected labels
+            semaphore: Gate limiting the number of in-flight batches, already
+                       acquired by the caller and released here
+            executor: Executor running the synchronous pipeline call
+            confusion_matrix: Run-wide counters updated with each valid prediction
+            record_misclassified: Receives each incorrectly predicted case
+        """
+        try:
+            batch_data = [entry.input_data for entry in batch]
+            logger.debug("Running pipeline for entries: %r", batch_data)
+            
+            # The pipeline is synchronous, so run it off the event loop
+            loop = asyncio.get_running_loop()
+            if self.use_processes:
+                try:
+                    pipeline_responses = await loop.run_in_executor(
+                        executor, _run_batch, config, batch_data
+                    )
+                except Exception as e:
+                    # A crashed worker or an unpicklable payload fails only this
+                    # batch, like a pipeline error does inside the service
+                    logger.error("Benchmark batch of %d entries failed in a worker process: %s", len(batch), e)
+                    pipeline_responses = [None] * len(batch)
+            else:
+                pipeline_responses = await loop.run_in_executor(
+                    executor,
+                    self.benchmark_service.execute_pipeline_batch,
+                    config,
+                    batch_data
+                )
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("%s", pipeline_responses)
+        finally:
+            semaphore.release()
 
-    def _process_prediction(self, pipeline_response: Optional[Dict], entry: BenchmarkEntry) -> Optional[BenchmarkResult]:
+        # Extract prediction from each pipeline response and count it right away.
+        # Tasks only resume on the event loop thread, so no lock is needed.
+        for pipeline_response, entry in zip(pipeline_responses, batch):
+            outcome = self._predict_outcome(pipeline_response, entry, config.label_value)
+            if outcome is None:
+                continue
+            is_actual_positive, is_predicted_positive = outcome
+            if BenchmarkService.record_outcome(confusion_matrix, is_actual_positive, is_predicted_positive):
+                # Full results are only built for the cases that get reported
+                record_misclassified(self._create_result(entry, is_predicted_positive))
+
+    def _predict_outcome(self, pipeline_response: Optional[Dict], entry: BenchmarkEntry,
+                         label_value: str) -> Optional[Tuple[bool, bool]]:
         """Extracts prediction from pipeline response and validates results.
         
         Args:
             pipeline_response: Raw output from pipeline execution
             entry: Original benchmark entry with expected label
+            label_value: Positive class identifier
             
         Returns:
-            BenchmarkResult if valid prediction found, None otherwise
+            Tuple (is_actual_positive, is_predicted_positive) if valid prediction
+            found, None otherwise
         """
         # Handle empty pipeline response
         if not pipeline_response:
-            logger.debug(f"Pipeline response is None for entry: {entry.input_data}")
+            logger.debug("Pipeline response is None for entry: %r", entry.input_data)
             return None
 
         # Find verification step in pipeline results
-        verify_step = next(
-            (s for s in pipeline_response
-             if s["step_type"] == "verify"),
-            None
-        )
+        verify_step = self._find_verify_step(pipeline_response)
         
         # Validate verification step existence
         if not verify_step:
             return None
 
-        # Check for valid step data
-        if not verify_step["step_data"]:
-            logger.debug(f"Verify step data is empty for entry: {entry.input_data}")
-            return None
-        
-        # Extract final verification status
-        step_data = verify_step.get("step_data", [])
+        # Check for valid step data, read once for the status below
+        step_data = verify_step["step_data"]
         if not step_data:
+            logger.debug("Verify step data is empty for entry: %r", entry.input_data)
             return None
         
         # Determine prediction based on verification outcome
-        final_status = step_data[0].get("final_status", "").lower()
+        final_status = step_data[0].get("final_status")
+        return entry.expected_label == label_value, final_status in CONFIRMED_STATUSES
+
+    def _create_result(self, entry: BenchmarkEntry, is_predicted_positive: bool) -> BenchmarkResult:
+        """Builds the full result record of an evaluated entry.
+        
+        Args:
+            entry: Original benchmark entry with expected label
+            is_predicted_positive: Whether the pipeline confirmed the entry
+            
+        Returns:
+            BenchmarkResult: Prediction details of the entry
+        """
         return BenchmarkResult(
             input_data=entry.input_data,
-            predicted_label="confirmed" if final_status == "confirmed" else "not_confirmed",
+            predicted_label="confirmed" if is_predicted_positive else "not_confirmed",
             actual_label=entry.expected_label,
-            timestamp=datetime.now()
-        )
\ No newline at end of file
+            run_started_at=self.run_started_at,
+            elapsed_us=(time.monotonic_ns() - self.run_clock_start_ns) // 1000
+        )
+
+    def _find_verify_step(self, pipeline_response: List[Dict]) -> Optional[Dict]:
+        """Gets the verification step from a pipeline response.
+        
+        Args:
+            pipeline_response: Raw output from pipeline execution
+            
+        Returns:
+            The verify step result, or None if the response has none
+        """
+        index = self.verify_step_index
+        if index is not None and index < len(pipeline_response) and pipeline_response[index]["step_type"] == "verify":
+            return pipeline_response[index]
+
+        # Fall back to scanning when the response does not match the configured layout
+        return next(
+            (s for s in pipeline_response
+             if s["step_type"] == "verify"),
+            None
+        )
@@ -1,9 +1,10 @@
 # application/use_cases/generate_text_use_case.py
 
 import logging
-from datetime import datetime
+import time
+from operator import attrgetter
 from domain.model.entities.generation import GenerateTextRequest, GenerateTextResponse
-from domain.services.generate_service import GenerateService
+from domain.services.generate_service import get_generate_service
 
 logger = logging.getLogger(__name__)
 
@@ -31,7 +32,7 @@ class GenerateTextUseCase:
                         Format should match HuggingFace model hub conventions.
         """
         # Dependency injection of generation service
-        self.generate_service = GenerateService(model_name)
+        self.generate_service = get_generate_service(model_name)
 
     def execute(self, request: GenerateTextRequest) -> GenerateTextResponse:
         """
@@ -59,7 +60,7 @@ class GenerateTextUseCase:
         logger.info("Executing GenerateTextUseCase")
         self._validate_request(request)  # Primary input validation
         
-        start_time = datetime.now()  # Precision timing started
+        start_ns = time.perf_counter_ns()  # Precision timing started
         
         try:
             logger.debug("Extracting core prompts from request")
@@ -78,12 +79,12 @@ class GenerateTextUseCase:
             )
             
             # Aggregate token usage across all generated sequences
-            total_tokens = sum(result.metadata.tokens_used for result in generated_results)
+            total_tokens = sum(map(attrgetter("metadata.tokens_used"), generated_results))
             
             # Calculate precise generation duration
-            generation_time = (datetime.now() - start_time).total_seconds()
+            generation_time = (time.perf_counter_ns() - start_ns) / 1e9
             
-            logger.info(f"Generated {len(generated_results)} sequence(s) in {generation_time:.4f}s with {total_tokens} tokens total.")
+            logger.info("Generated %d sequence(s) in %.4fs with %d tokens total.", len(generated_results), generation_time, total_tokens)
             
             return GenerateTextResponse(
                 generated_texts=generated_results,
@@ -112,12 +113,10 @@ class GenerateTextUseCase:
         Raises:
             ValueError: For any validation failure with descriptive message
         """
-        # System prompt validation
+        # System prompt validation; the caller logs the raised error
         if not request.system_prompt.strip():
-            logger.error("Empty system prompt detected")
             raise ValueError("System prompt cannot be empty or whitespace.")
         
         # User prompt validation
         if not request.user_prompt.strip():
-            logger.error("Empty user prompt detected")
             raise ValueError("User prompt cannot be empty or whitespace.")
\ No newline at end of file
@@ -1,7 +1,8 @@
 # application/use_cases/parse_use_case.py
 
 import logging
-from domain.model.entities.parsing import ParseRequest, ParseResponse
+import re
+from domain.model.entities.parsing import ParseMode, ParseRequest, ParseResponse
 from domain.services.parse_service import ParseService
 
 logger = logging.getLogger(__name__)
@@ -66,7 +67,7 @@ class ParseUseCase:
             self._validate_request(request)
         except ValueError as e:
             # Convert generic ValueError to domain-specific exception
-            logger.error(f"Request validation failed: {str(e)}")
+            logger.error("Request validation failed: %s", e)
             raise ParseRequestValidationError(f"Invalid parse request: {e}") from e
 
         try:
@@ -102,6 +103,7 @@ class ParseUseCase:
         1. Input text must contain non-whitespace content
         2. At least one parsing rule must be provided
         3. All rules must have non-empty pattern definitions
+        4. Regex rules must compile (compiled patterns are cached for parsing)
         
         Args:
             request: Parse request to validate
@@ -120,4 +122,11 @@ class ParseUseCase:
         # Validate individual rule completeness
         for rule in request.rules:
             if not rule.pattern:
-                raise ValueError(f"Rule '{rule.name}' missing required pattern")
\ No newline at end of file
+                raise ValueError(f"Rule '{rule.name}' missing required pattern")
+            if rule.mode == ParseMode.REGEX:
+                if rule.regex_engine not in ("re", "re2"):
+                    raise ValueError(f"Rule '{rule.name}' has an unknown regex engine: {rule.regex_engine}")
+                try:
+                    rule.compiled_pattern
+                except re.error as e:
+                    raise ValueError(f"Rule '{rule.name}' has an invalid regex pattern: {e}") from e
\ No newline at end of file
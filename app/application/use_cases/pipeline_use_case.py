@@ -1,8 +1,15 @@
 # application/use_cases/pipeline_use_case.py
 
+import asyncio
+import copy
+import hashlib
 import json
 import logging
-from typing import List
+import threading
+from collections import OrderedDict, deque
+from concurrent.futures import Executor, ThreadPoolExecutor
+from itertools import chain, islice
+from typing import Callable, Dict, Iterable, List, Optional
 
 from domain.model.entities.pipeline import PipelineRequest, PipelineResponse
 from domain.services.pipeline_service import PipelineService
@@ -10,6 +17,11 @@ from infrastructure.file_repository import FileRepository
 
 logger = logging.getLogger(__name__)
 
+# Maximum number of per-entry pipeline responses kept for duplicate entries
+RESULT_CACHE_SIZE = 1024
+# Maximum number of failed entry numbers listed in the failure summary
+FAILED_ENTRIES_LOGGED = 20
+
 class PipelineUseCase:
     """
     Orchestrates pipeline execution and handles reference data processing.
@@ -31,8 +43,12 @@ class PipelineUseCase:
             generation_model_name: Model identifier for text generation
             verify_model_name: Model identifier for verification tasks
         """
+        # Own run state on top of the process-wide loaded models
         self.service = PipelineService(generation_model_name, verify_model_name)
         self.file_repo = FileRepository()
+        # LRU cache of responses by (steps, entry) digest; chunks run in worker threads
+        self._result_cache: "OrderedDict[bytes, PipelineResponse]" = OrderedDict()
+        self._result_cache_lock = threading.Lock()
         logger.debug("Initialized PipelineUseCase with models: %s (gen), %s (verify)",
                     generation_model_name, verify_model_name)
 
@@ -48,9 +64,10 @@ class PipelineUseCase:
         """
         logger.info("Starting single pipeline execution")
         try:
+            # Always replace the references left by a previous run
             if request.global_references:
                 logger.debug("Loading %d global references", len(request.global_references))
-                self.service.global_references = request.global_references
+            self.service.global_references = request.global_references or {}
 
             self.service.run_pipeline(request.steps)
             
@@ -68,42 +85,246 @@ class PipelineUseCase:
 
     def execute_with_references(self, 
                                request: PipelineRequest, 
-                               reference_entries: List[dict]) -> PipelineResponse: 
+                               reference_entries: Iterable[dict],
+                               batch_size: int = 16,
+                               concurrency: int = 8,
+                               on_chunk: Optional[Callable[[List[PipelineResponse]], None]] = None) -> PipelineResponse: 
+        """
+        Executes the pipeline once per reference entry, batching entries together.
+        
+        Entries advance through the pipeline in chunks of batch_size, so every
+        generate or verify step sends the prompts of the whole chunk to the model
+        in a single batched call. Up to `concurrency` chunks run at the same time,
+        overlapping one chunk's model calls with another's parsing; the model
+        calls themselves take turns on the shared GenerateService.
         
+        Args:
+            request: Pipeline configuration shared by all entries
+            reference_entries: Reference data for each execution; may be a lazy
+                               iterable, which is only read as chunks are started
+            batch_size: Maximum number of entries executed together
+            concurrency: Maximum number of chunks processed at the same time
+            on_chunk: Optional callback receiving the successful responses of each
+                      chunk, in entry order, as soon as the chunk and every earlier
+                      one are done; lets results be saved while the run goes on.
+                      Called on a single writer thread, so it may block on I/O
+            
+        Returns:
+            PipelineResponse: Results of all entries, in entry order
+        """
         logger.info("Starting multi-reference pipeline execution")
+        return asyncio.run(self._execute_with_references_async(
+            request, reference_entries, batch_size, concurrency, on_chunk
+        ))
+
+    async def _execute_with_references_async(self,
+                                             request: PipelineRequest,
+                                             reference_entries: Iterable[dict],
+                                             batch_size: int,
+                                             concurrency: int,
+                                             on_chunk: Optional[Callable[[List[PipelineResponse]], None]] = None
+                                             ) -> PipelineResponse:
+        """
+        Runs the chunks of reference entries concurrently and merges their results.
         
-        cumulative_response = PipelineResponse(step_results=[], verification_references={'confirmed': [], 'to_verify': []})
-
-        for idx, entry in enumerate(reference_entries): 
-            try:
-                logger.debug("Processing reference entry %d/%d", idx+1, len(reference_entries))
-                result = self._process_single_entry(request, entry)
-                cumulative_response.step_results.extend(result.step_results)
-                cumulative_response.verification_references['confirmed'].extend(result.verification_references['confirmed'])
-                cumulative_response.verification_references['to_verify'].extend(result.verification_references['to_verify'])
-                
-            except Exception as e:
-                logger.warning("Failed processing entry %d: %s", idx+1, str(e))
-                continue
+        Args:
+            request: Pipeline configuration shared by all entries
+            reference_entries: Reference data for each execution
+            batch_size: Maximum number of entries executed together
+            concurrency: Maximum number of chunks processed at the same time
+            on_chunk: Optional callback receiving each chunk's successful responses
+            
+        Returns:
+            PipelineResponse: Results of all entries, in entry order
+        """
+        loop = asyncio.get_running_loop()
+        semaphore = asyncio.Semaphore(concurrency)
+        reference_entries = iter(reference_entries)
+        # Tasks not yet collected, in chunk order, so results are merged in entry order
+        tasks: "deque[asyncio.Task]" = deque()
+        responses: List[PipelineResponse] = []
+        failed_entries: List[int] = []
+        # Pending on_chunk calls, awaited before returning so their errors surface
+        writes: List[asyncio.Future] = []
+        start = 0
+
+        def collect(chunk_results: List[Optional[PipelineResponse]]) -> None:
+            """Keeps the successful responses of the next chunk in entry order."""
+            entry_number = len(responses) + len(failed_entries)
+            chunk_responses = []
+            for offset, result in enumerate(chunk_results, 1):
+                if result is None:
+                    failed_entries.append(entry_number + offset)
+                else:
+                    chunk_responses.append(result)
+            responses.extend(chunk_responses)
+            if on_chunk is not None:
+                # One writer thread keeps blocking writes off the event loop and
+                # runs them in chunk order
+                writes.append(loop.run_in_executor(writer, on_chunk, chunk_responses))
+
+        with ThreadPoolExecutor(max_workers=concurrency) as executor, \
+                ThreadPoolExecutor(max_workers=1) as writer:
+            while True:
+                # Claim a slot before pulling the next chunk so lazy iterables
+                # are never read further ahead than the work in flight
+                await semaphore.acquire()
+                # A free slot means a chunk finished; hand over every finished
+                # chunk that no earlier chunk is still waiting on
+                while tasks and tasks[0].done():
+                    collect(tasks.popleft().result())
+                chunk = list(islice(reference_entries, batch_size))
+                if not chunk:
+                    semaphore.release()
+                    break
+                tasks.append(asyncio.create_task(
+                    self._process_chunk(request, chunk, start, semaphore, executor)
+                ))
+                start += len(chunk)
+            while tasks:
+                collect(await tasks.popleft())
+            await asyncio.gather(*writes)
+
+        # One summary instead of a warning per entry, since failures tend to be systematic
+        if failed_entries:
+            logger.warning("Failed processing %d/%d entries: %s%s",
+                           len(failed_entries), start,
+                           ", ".join(map(str, failed_entries[:FAILED_ENTRIES_LOGGED])),
+                           ", ..." if len(failed_entries) > FAILED_ENTRIES_LOGGED else "")
+
+        # Each merged list is built in one pass instead of growing entry by entry
+        cumulative_response = PipelineResponse(
+            step_results=list(chain.from_iterable(response.step_results for response in responses)),
+            verification_references={
+                result_type: list(chain.from_iterable(
+                    response.verification_references[result_type] for response in responses
+                ))
+                for result_type in ('confirmed', 'to_verify')
+            }
+        )
 
         return cumulative_response
 
-    def _process_single_entry(self, 
-                             base_request: PipelineRequest,
-                             entry_data: dict) -> PipelineResponse:
+    async def _process_chunk(self,
+                             request: PipelineRequest,
+                             chunk: List[dict],
+                             start: int,
+                             semaphore: asyncio.Semaphore,
+                             executor: Executor) -> List[Optional[PipelineResponse]]:
+        """
+        Processes one chunk of reference entries off the event loop.
+        
+        Each run gets its own pipeline state from the service, so chunks can
+        execute in parallel threads while sharing the loaded models.
+        
+        Args:
+            request: Pipeline configuration shared by all entries
+            chunk: Reference data for each execution of the chunk
+            start: Index of the first entry of the chunk
+            semaphore: Gate limiting the number of in-flight chunks, already
+                       acquired by the caller and released here
+            executor: Executor running the synchronous pipeline call
+            
+        Returns:
+            Results for each entry of the chunk (None where its pipeline failed)
+        """
+        try:
+            logger.debug("Processing reference entries %d-%d", start+1, start+len(chunk))
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(executor, self._process_entries, request, chunk)
+        except Exception as e:
+            logger.warning("Failed processing entries %d-%d: %s", start+1, start+len(chunk), str(e))
+            return [None] * len(chunk)
+        finally:
+            semaphore.release()
+
+    def _process_entries(self, 
+                         base_request: PipelineRequest,
+                         entries_data: List[dict]) -> List[Optional[PipelineResponse]]:
         """
-        Processes a single reference entry through the pipeline.
+        Processes several reference entries through the pipeline in lockstep.
+        
+        When the request enables caching, entries already seen with the same
+        steps reuse the earlier response, and duplicates within the chunk run
+        only once. Failed runs are never cached. Every entry gets its own
+        copy of a reused response, so callers may modify them freely.
         
         Args:
             base_request: Original pipeline configuration
-            entry_data: Specific reference data for this execution
+            entries_data: Specific reference data for each execution
             
         Returns:
-            PipelineResponse: Results for this single entry
+            Results for each entry (None where its pipeline failed), in input order
         """
-        modified_request = PipelineRequest(
-            steps=base_request.steps,
-            global_references=entry_data
-        )
+        modified_requests = [
+            PipelineRequest(
+                steps=base_request.steps,
+                global_references=entry_data,
+                enable_cache=base_request.enable_cache
+            )
+            for entry_data in entries_data
+        ]
+
+        if not base_request.enable_cache:
+            return self.service.run_pipeline_batch(modified_requests)
+
+        steps_key = repr(base_request.steps).encode("utf-8")
+        keys = [self._cache_key(steps_key, entry_data) for entry_data in entries_data]
+        with self._result_cache_lock:
+            results = [self._cache_lookup(key) for key in keys]
+
+        # First index of every distinct entry missing from the cache
+        pending: Dict[bytes, int] = {}
+        for index, (key, result) in enumerate(zip(keys, results)):
+            if result is None:
+                pending.setdefault(key, index)
+
+        responses: Dict[bytes, Optional[PipelineResponse]] = {}
+        if pending:
+            logger.debug("Result cache: %d hit(s), %d run(s)", len(keys) - len(pending), len(pending))
+            responses = dict(zip(
+                pending,
+                self.service.run_pipeline_batch([modified_requests[index] for index in pending.values()])
+            ))
+            with self._result_cache_lock:
+                for key, response in responses.items():
+                    if response is not None:
+                        self._cache_store(key, copy.deepcopy(response))
+
+        # Cached responses are never modified once stored, so they are copied
+        # outside the lock; only the first run of a pending entry is handed out as is
+        return [
+            responses[key] if result is None and pending[key] == index
+            else copy.deepcopy(responses[key] if result is None else result)
+            for index, (key, result) in enumerate(zip(keys, results))
+        ]
+
+    @staticmethod
+    def _cache_key(steps_key: bytes, entry_data: dict) -> bytes:
+        """
+        Builds the result cache key of an entry run with the given steps.
         
-        return self._execute(modified_request)
+        Args:
+            steps_key: Stable encoding of the pipeline steps
+            entry_data: Reference data of the entry
+            
+        Returns:
+            bytes: 16-byte digest identifying the (steps, entry) pair
+        """
+        digest = hashlib.blake2b(steps_key, digest_size=16)
+        digest.update(json.dumps(entry_data, sort_keys=True, default=str).encode("utf-8"))
+        return digest.digest()
+
+    def _cache_lookup(self, key: bytes) -> Optional[PipelineResponse]:
+        """Returns the cached response for key, marking it recently used. Caller holds the lock."""
+        response = self._result_cache.get(key)
+        if response is not None:
+            self._result_cache.move_to_end(key)
+        return response
+
+    def _cache_store(self, key: bytes, response: PipelineResponse) -> None:
+        """Caches a response, evicting the least recently used one. Caller holds the lock."""
+        self._result_cache[key] = response
+        self._result_cache.move_to_end(key)
+        if len(self._result_cache) > RESULT_CACHE_SIZE:
+            self._result_cache.popitem(last=False)
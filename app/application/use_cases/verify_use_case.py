@@ -1,12 +1,20 @@
 # application/use_cases/verify_use_case.py
 
 import logging
-from datetime import datetime
+import time
 from domain.model.entities.verification import VerifyRequest, VerifyResponse
 from domain.services.verifier_service import VerifierService
 
 logger = logging.getLogger(__name__)
 
+# Messages of the request-level checks in VerifyUseCase._validate_request, in check order
+REQUEST_ERRORS = (
+    "At least one verification method required",
+    "Confirmed threshold must be positive",
+    "Review threshold must be positive",
+    "Confirmed threshold must exceed review threshold",
+)
+
 class VerifyUseCase:
     """
     Orchestrates verification processes using multiple validation methods.
@@ -60,18 +68,22 @@ class VerifyUseCase:
         logger.info("Starting verification workflow")
         self._validate_request(request)  # Primary validation
         
-        start_time = datetime.now()  # Precision timing started
+        start_ns = time.perf_counter_ns()  # Precision timing started
         
         try:
             logger.debug("Executing %d verification methods", len(request.methods))
             verification_summary = self.verifier_service.verify(
                 methods=request.methods,
                 required_for_confirmed=request.required_for_confirmed,
-                required_for_review=request.required_for_review
+                required_for_review=request.required_for_review,
+                # A single request gains nothing from lockstep batching, so its
+                # methods are generated in two rounds: ELIMINATORY ones, then the
+                # CUMULATIVE ones only if none of those failed
+                eager=True
             )
             
             # Calculate performance metrics
-            execution_time = (datetime.now() - start_time).total_seconds()
+            execution_time = (time.perf_counter_ns() - start_ns) / 1e9
             success_rate = verification_summary.success_rate
             
             logger.info("Verification completed in %.4fs (success rate: %.2f)", 
@@ -109,30 +121,30 @@ class VerifyUseCase:
         """
         logger.debug("Validating verification request parameters")
         
-        # Global parameter validation
-        if not request.methods:
-            logger.error("Missing verification methods")
-            raise ValueError("At least one verification method required")
-            
-        if request.required_for_confirmed <= 0:
-            raise ValueError("Confirmed threshold must be positive")
-            
-        if request.required_for_review <= 0:
-            raise ValueError("Review threshold must be positive")
-            
-        if request.required_for_confirmed <= request.required_for_review:
-            raise ValueError("Confirmed threshold must exceed review threshold")
+        # Global parameter validation, evaluated together; the first failing
+        # check selects its message from REQUEST_ERRORS
+        failed_checks = (
+            not request.methods,
+            request.required_for_confirmed <= 0,
+            request.required_for_review <= 0,
+            request.required_for_confirmed <= request.required_for_review,
+        )
+        if any(failed_checks):
+            # The caller reports the failure, so the message is only built once
+            raise ValueError(REQUEST_ERRORS[failed_checks.index(True)])
 
-        # Per-method validation
-        for method in request.methods:
-            if method.required_matches is None:
-                continue
-                
-            if method.required_matches <= 0:
-                raise ValueError(f"{method.name}: Required matches must be positive")
-                
-            if method.required_matches > method.num_sequences:
-                raise ValueError(
-                    f"{method.name}: Required matches ({method.required_matches}) "
-                    f"exceed available sequences ({method.num_sequences})"
-                )
\ No newline at end of file
+        # Per-method validation: find the first method with out-of-range required matches
+        invalid_method = next((
+            method for method in request.methods
+            if method.required_matches is not None
+            and not 0 < method.required_matches <= method.num_sequences
+        ), None)
+        if invalid_method is None:
+            return
+            
+        if invalid_method.required_matches <= 0:
+            raise ValueError(f"{invalid_method.name}: Required matches must be positive")
+        raise ValueError(
+            f"{invalid_method.name}: Required matches ({invalid_method.required_matches}) "
+            f"exceed available sequences ({invalid_method.num_sequences})"
+        )
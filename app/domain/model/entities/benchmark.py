@@ -1,7 +1,7 @@
 # domain/model/entities/benchmark.py
 
 from dataclasses import dataclass
-from datetime import datetime
+from datetime import datetime, timedelta
 from typing import Any, Dict, List
 from domain.model.entities.pipeline import PipelineStep
 
@@ -42,15 +42,23 @@ class BenchmarkResult:
         input_data: Original input data used for prediction
         predicted_label: Model-generated prediction
         actual_label: Ground truth label from dataset
-        timestamp: Execution time of the test case
+        run_started_at: Start time of the benchmark run, shared by all its results
+        elapsed_us: Microseconds from the start of the run to the test case execution
         
     Methods:
+        timestamp: Execution time of the test case
         to_dict: Serializes result for storage/transmission
     """
     input_data: Dict[str, Any]
     predicted_label: str
     actual_label: str
-    timestamp: datetime
+    run_started_at: datetime
+    elapsed_us: int = 0
+
+    @property
+    def timestamp(self) -> datetime:
+        """Execution time of the test case, built only when requested."""
+        return self.run_started_at + timedelta(microseconds=self.elapsed_us)
 
     def to_dict(self) -> dict:
         """Converts result to JSON-serializable dictionary format."""
@@ -76,7 +84,8 @@ class BenchmarkMetrics:
             - false_positive: Incorrect positive predictions
             - true_negative: Correct negative predictions
             - false_negative: Incorrect negative predictions
-        misclassified: List of incorrectly predicted cases
+        misclassified: List of incorrectly predicted cases. Empty when the cases
+            were streamed elsewhere during the run
         
     Methods:
         to_dict: Serializes metrics for reporting/analysis
@@ -96,5 +105,5 @@ class BenchmarkMetrics:
             "recall": self.recall,
             "f1_score": self.f1_score,
             "confusion_matrix": self.confusion_matrix,
-            "misclassified_count": len(self.misclassified)
+            "misclassified_count": self.confusion_matrix["false_positive"] + self.confusion_matrix["false_negative"]
         }
\ No newline at end of file
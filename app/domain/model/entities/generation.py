@@ -1,10 +1,12 @@
 # domain/model/entities/generation.py
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
 from typing import List, Optional, Dict
 
-@dataclass(frozen=True)
+from domain.model.entities.slots import SLOTS
+
+@dataclass(frozen=True, **SLOTS)
 class GenerationMetadata:
     """
     Immutable record of generation process metadata.
@@ -24,9 +26,21 @@ class GenerationMetadata:
     temperature: float
     tokens_used: int
     generation_time: float
-    timestamp: datetime = datetime.now()
+    timestamp: datetime = field(default_factory=datetime.now)
 
-@dataclass
+    def to_dict(self) -> Dict:
+        """Serializes metadata to JSON-friendly dictionary format."""
+        return {
+            "model_name": self.model_name,
+            "system_prompt": self.system_prompt,
+            "user_prompt": self.user_prompt,
+            "temperature": self.temperature,
+            "tokens_used": self.tokens_used,
+            "generation_time": self.generation_time,
+            "timestamp": self.timestamp.isoformat()
+        }
+
+@dataclass(**SLOTS)
 class GeneratedResult:
     """
     Complete record of a single generated text output with context.
@@ -44,20 +58,16 @@ class GeneratedResult:
     content: str
     metadata: GenerationMetadata
     reference_data: Optional[Dict[str, str]] = None
+    # Case-folded content, computed on the first contains_reference call
+    _content_casefold: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+    # Whitespace-separated token count, computed on the first word_count call
+    _word_count: Optional[int] = field(default=None, init=False, repr=False, compare=False)
     
     def to_dict(self):
         """Serializes object to JSON-friendly dictionary format."""
         return {
             "content": self.content,
-            "metadata": {
-                "model_name": self.metadata.model_name,
-                "system_prompt": self.metadata.system_prompt,
-                "user_prompt": self.metadata.user_prompt,
-                "temperature": self.metadata.temperature,  # Fixed from original code
-                "tokens_used": self.metadata.tokens_used,
-                "generation_time": self.metadata.generation_time,
-                "timestamp": self.metadata.timestamp.isoformat()
-            },
+            "metadata": self.metadata.to_dict(),
             "reference_data": self.reference_data
         }
     
@@ -71,7 +81,9 @@ class GeneratedResult:
         Returns:
             bool: True if text found in content (case-insensitive)
         """
-        return text.lower() in self.content.lower()
+        if self._content_casefold is None:
+            self._content_casefold = self.content.casefold()
+        return text.casefold() in self._content_casefold
     
     def word_count(self) -> int:
         """
@@ -85,7 +97,11 @@ class GeneratedResult:
         Returns:
             int: Number of whitespace-separated tokens
         """
-        return len(self.content.split())
+        if self._word_count is None:
+            # str.split runs in C and beats counting regex matches by several times,
+            # so the transient list is paid once and the count is kept
+            self._word_count = len(self.content.split())
+        return self._word_count
 
 @dataclass
 class GenerateTextRequest:
@@ -1,9 +1,89 @@
 # domain/model/entities/parsing.py
 
+import re
 from dataclasses import dataclass
-from typing import Dict, List, Optional, Literal
+from functools import cached_property, lru_cache
+from typing import Any, Dict, List, Optional, Literal, Pattern, Tuple
 from enum import Enum
 
+from domain.model.entities.slots import SLOTS
+
+try:
+    import re2
+except ImportError:  # google-re2 is optional; patterns are then compiled with re
+    re2 = None
+
+try:
+    import ahocorasick
+except ImportError:  # pyahocorasick is optional; keywords are then located with str.find
+    ahocorasick = None
+
+if re2 is not None:
+    _RE2_OPTIONS = re2.Options()
+    _RE2_OPTIONS.log_errors = False  # Unsupported patterns fall back to re silently
+
+@lru_cache(maxsize=4096)
+def _compile_pattern(pattern: str, engine: str = "re") -> Pattern:
+    """
+    Compiles a regex rule pattern once and shares it across rules and requests.
+    
+    Patterns use re unless the rule asks for the linear-time RE2 engine, whose
+    \\w, \\d, \\s and \\b only match ASCII characters. RE2 rules fall back to re
+    when RE2 is not installed or does not support the pattern (backreferences,
+    lookarounds, ...).
+    """
+    if engine == "re2" and re2 is not None:
+        try:
+            return re2.compile(pattern, options=_RE2_OPTIONS)
+        except re2.error:
+            pass
+    return re.compile(pattern)
+
+@lru_cache(maxsize=256)
+def compile_pattern_set(patterns: Tuple[str, ...]) -> Optional[Any]:
+    """
+    Compiles several regex rule patterns into one RE2 set, scanned in a single pass.
+    
+    Matching the set reports which patterns occur in a text (not where), so
+    callers only run the per-pattern scans that can find something. Only
+    patterns of rules that opted into RE2 belong in the set, since re gives
+    other results for non-ASCII text.
+    
+    Returns:
+        The compiled re2.Set, or None when RE2 is not installed, there are
+        fewer than two patterns, or a pattern is not supported by RE2
+    """
+    if re2 is None or len(patterns) < 2:
+        return None
+    pattern_set = re2.Set.SearchSet(_RE2_OPTIONS)
+    try:
+        for pattern in patterns:
+            pattern_set.Add(pattern)
+        pattern_set.Compile()
+    except re2.error:
+        return None
+    return pattern_set
+
+@lru_cache(maxsize=256)
+def compile_keyword_automaton(keywords: Tuple[str, ...]) -> Optional[Any]:
+    """
+    Builds an Aho-Corasick automaton finding every occurrence of several keywords
+    in a single pass over a text.
+    
+    Returns:
+        The automaton (each keyword stored as its own value), or None when
+        pyahocorasick is not installed, there are fewer than two distinct
+        keywords, or a keyword is empty
+    """
+    distinct = set(keywords)
+    if ahocorasick is None or len(distinct) < 2 or "" in distinct:
+        return None
+    automaton = ahocorasick.Automaton()
+    for keyword in distinct:
+        automaton.add_word(keyword, keyword)
+    automaton.make_automaton()
+    return automaton
+
 class ParseMode(Enum):
     """
     Defines parsing strategies for text extraction.
@@ -15,7 +95,7 @@ class ParseMode(Enum):
     REGEX = "regex"
     KEYWORD = "keyword"
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, **SLOTS)
 class ParseMatch:
     """
     Represents a single successful match from a parsing rule.
@@ -27,7 +107,8 @@ class ParseMatch:
     rule_name: str
     value: str
 
-@dataclass
+# One instance per parsed text
+@dataclass(**SLOTS)
 class ParseResult:
     """
     Contains complete results from parsing operation with structured access methods.
@@ -71,6 +152,8 @@ class ParseRule:
         secondary_pattern: Optional boundary marker for KEYWORD mode 
             (defines substring end point)
         fallback_value: Default value if pattern matching fails
+        regex_engine: Engine for REGEX mode patterns: 're' (default) or
+            're2', linear-time but with ASCII-only \\w, \\d, \\s and \\b
         
     Immutable to ensure consistent parsing behavior
     """
@@ -79,6 +162,26 @@ class ParseRule:
     mode: ParseMode
     secondary_pattern: Optional[str] = None
     fallback_value: Optional[str] = None
+    regex_engine: Literal["re", "re2"] = "re"
+
+    @property
+    def compiled_pattern(self) -> Pattern:
+        """
+        Compiled form of pattern for REGEX mode rules.
+        
+        Raises:
+            re.error: If pattern is not a valid regular expression
+        """
+        return _compile_pattern(self.pattern, self.regex_engine)
+
+    @cached_property
+    def missing_value(self) -> str:
+        """
+        Value stored for this rule in entries where it did not match:
+        fallback_value, or 'missing_<name>' when no fallback is configured.
+        Resolved once per rule instead of once per parsed entry.
+        """
+        return self.fallback_value or f"missing_{self.name}"
 
 @dataclass
 class ParseRequest:
@@ -100,7 +203,7 @@ class ParseRequest:
     output_filter: Literal["all", "successful", "first_n"] = "all"
     output_limit: Optional[int] = None
 
-@dataclass
+@dataclass(**SLOTS)
 class ParseResponse:
     """
     Final output of parsing operation after applying filters.
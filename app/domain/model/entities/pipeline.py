@@ -1,13 +1,21 @@
 # app/domain/model/entities/pipeline.py
 
+import sys
 from dataclasses import dataclass, field
 from typing import Any, Dict, List, Optional, Union
 
 from domain.model.entities.generation import GenerateTextRequest
 from domain.model.entities.parsing import ParseRequest
+from domain.model.entities.slots import SLOTS
 from domain.model.entities.verification import VerifyRequest
 
-@dataclass
+# Parameters accepted by a step; the step's type selects which one applies
+StepParameters = Union[GenerateTextRequest, ParseRequest, VerifyRequest]
+
+# Step types the pipeline can execute
+STEP_TYPES = frozenset({"generate", "parse", "verify"})
+
+@dataclass(**SLOTS)
 class PipelineStep:
     """
     Represents a single step in the processing pipeline.
@@ -27,11 +35,20 @@ class PipelineStep:
                                reference data. Ordered by priority.
     """
     type: str
-    parameters: Union[GenerateTextRequest, ParseRequest, VerifyRequest]
+    parameters: StepParameters
     uses_reference: bool = False
     reference_step_numbers: Optional[List[int]] = None
 
-@dataclass
+    def __post_init__(self):
+        # Unknown types are rejected when the pipeline is configured rather
+        # than skipped with a warning once it runs
+        if self.type not in STEP_TYPES:
+            raise ValueError(f"Invalid step type: {self.type}")
+        # Step types come from a tiny vocabulary and travel into every stored
+        # result, so all steps share one interned string per type
+        self.type = sys.intern(self.type)
+
+@dataclass(**SLOTS)
 class PipelineRequest:
     """
     Complete configuration for executing a processing pipeline.
@@ -41,11 +58,18 @@ class PipelineRequest:
               processing workflow
         global_references: Optional shared reference data available 
                           to all steps through {placeholder} syntax
+        enable_cache: Whether repeated reference entries may reuse the
+                     response of an identical earlier run instead of
+                     sampling the models again. Off by default, since
+                     steps sampled at temperature > 0 would otherwise give
+                     every duplicate entry the same sample
     """
     steps: List[PipelineStep]
     global_references: Optional[Dict[str, str]] = None
+    enable_cache: bool = False
 
-@dataclass
+# One instance per reference entry
+@dataclass(**SLOTS)
 class PipelineResponse:
     """
     Aggregated results from executing a processing pipeline.
@@ -0,0 +1,9 @@
+# domain/model/entities/slots.py
+
+import sys
+
+# Entities created once per generated sequence, parsed match or pipeline step
+# drop the per-instance __dict__ where dataclasses support slots (Python 3.10+).
+# Spread into the decorator, e.g. @dataclass(frozen=True, **SLOTS), so frozen
+# classes keep the pickle and copy support dataclasses add for them
+SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
@@ -1,7 +1,8 @@
 # domain/model/entities/verification.py
 
-from dataclasses import dataclass
-from typing import List, Optional, Dict
+from dataclasses import dataclass, field
+from functools import cached_property
+from typing import List, Optional, Dict, Tuple
 from enum import Enum
 from datetime import datetime
 
@@ -76,7 +77,7 @@ class VerificationResult:
     passed: bool
     score: Optional[float] = None
     details: Optional[Dict[str, any]] = None
-    timestamp: datetime = datetime.now()
+    timestamp: datetime = field(default_factory=datetime.now)
 
     def to_dict(self):
         """Serializes result for storage/analysis."""
@@ -94,6 +95,9 @@ class VerificationSummary:
     """
     Aggregated results of multiple verification methods.
     
+    The derived method lists are computed on first access and cached, so
+    results must not be modified once the summary is built.
+    
     Attributes:
         results: All method execution outcomes
         final_status: Overall verification conclusion
@@ -112,15 +116,24 @@ class VerificationSummary:
             "success_rate": self.success_rate
         }
 
+    @cached_property
+    def _partition(self) -> Tuple[List[str], List[str], List[Optional[float]]]:
+        """Passed names, failed names and scores, collected in one pass over results."""
+        passed, failed, scores = [], [], []
+        for result in self.results:
+            (passed if result.passed else failed).append(result.method.name)
+            scores.append(result.score)
+        return passed, failed, scores
+
     @property
     def passed_methods(self) -> List[str]:
         """Names of successful verification methods."""
-        return [result.method.name for result in self.results if result.passed]
+        return self._partition[0]
     
     @property
     def failed_methods(self) -> List[str]:
         """Names of failed verification methods."""
-        return [result.method.name for result in self.results if not result.passed]
+        return self._partition[1]
     
     @property
     def success_rate(self) -> float:
@@ -130,7 +143,7 @@ class VerificationSummary:
     @property
     def scores(self) -> List[Optional[float]]:
         """Collection of individual method scores for analysis."""
-        return [result.score for result in self.results]
+        return self._partition[2]
 
 @dataclass
 class VerifyRequest:
@@ -175,30 +188,35 @@ class VerificationStatus:
 
     @classmethod
     def confirmed(cls):
-       return cls(id="CONFIRMED", status="confirmed")
+       return cls._CONFIRMED
     
     @classmethod
     def discarded(cls):
-       return cls(id="DISCARDED", status="discarded")
+       return cls._DISCARDED
 
     @classmethod
     def review(cls):
-       return cls(id="REVIEW", status="review")
+       return cls._REVIEW
     
     @classmethod
     def from_string(cls, status: str) -> Optional['VerificationStatus']:
         """Creates status from string (case-insensitive)."""
-        status = status.lower()
-        return {
-            'confirmed': cls.confirmed(),
-            'discarded': cls.discarded(),
-            'review': cls.review()
-        }.get(status)
+        return cls._BY_NAME.get(status.lower())
         
     def is_final(self) -> bool:
         """Determines if status is terminal (no further action needed)."""
-        return self in [self.confirmed(), self.discarded()]
+        return self == VerificationStatus._CONFIRMED or self == VerificationStatus._DISCARDED
 
     def requires_review(self) -> bool:
         """Checks if status requires human intervention."""
-        return self == self.review()
\ No newline at end of file
+        return self == VerificationStatus._REVIEW
+
+# The factory methods hand out these shared instances instead of building a new
+# status on every call; equality still holds for statuses created directly
+VerificationStatus._CONFIRMED = VerificationStatus(id="CONFIRMED", status="confirmed")
+VerificationStatus._DISCARDED = VerificationStatus(id="DISCARDED", status="discarded")
+VerificationStatus._REVIEW = VerificationStatus(id="REVIEW", status="review")
+VerificationStatus._BY_NAME = {
+    status.status: status
+    for status in (VerificationStatus._CONFIRMED, VerificationStatus._DISCARDED, VerificationStatus._REVIEW)
+}
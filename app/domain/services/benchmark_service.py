@@ -1,14 +1,24 @@
 # domain/services/benchmark_service.py
 
 import logging
-from copy import deepcopy
-from typing import Any, Dict, List, Optional
+from dataclasses import replace
+from typing import Any, Dict, List, Optional, Tuple
 
 from domain.model.entities.benchmark import BenchmarkConfig, BenchmarkResult, BenchmarkMetrics
-from domain.services.pipeline_service import PipelineService
+from domain.model.entities.pipeline import PipelineRequest
+from domain.services.pipeline_service import PLACEHOLDER_PATTERN, PipelineService
 
 logger = logging.getLogger(__name__)
 
+# Outcome names of the confusion matrix cells, by 2 * is_actual_positive + is_predicted_positive
+CONFUSION_MATRIX_CELLS = ("true_negative", "false_positive", "false_negative", "true_positive")
+
+# Step parameter fields whose {placeholders} are filled with each entry's data
+TEMPLATE_FIELDS = ("system_prompt", "user_prompt", "text")
+
+# A template split once: leading literal, then (key, placeholder, literal) segments
+TemplateParts = Tuple[str, Tuple[Tuple[str, str, str], ...]]
+
 class BenchmarkService:
     """
     Service handling benchmark execution and metric calculations.
@@ -30,7 +40,8 @@ class BenchmarkService:
         """
         self.model_name = model_name
         self.pipeline_service = PipelineService(model_name, model_name)
-        self.results: List[BenchmarkResult] = []
+        # Split templates keyed by template text, None when a template has no placeholders
+        self._template_parts: Dict[str, Optional[TemplateParts]] = {}
 
     def execute_pipeline_for_entry(self, config: BenchmarkConfig, entry: Dict) -> Optional[List[Dict[str, Any]]]:
         """
@@ -43,19 +54,39 @@ class BenchmarkService:
         Returns:
             Pipeline results or None if execution fails
         """
-        try:
-            # Set entry data as global references for placeholder substitution
-            self.pipeline_service.global_references = entry
-            
-            # Configure pipeline steps with entry-specific data
-            configured_steps = self._configure_steps(config.pipeline_steps, entry)
+        return self.execute_pipeline_batch(config, [entry])[0]
+
+    def execute_pipeline_batch(self, config: BenchmarkConfig, entries: List[Dict]) -> List[Optional[List[Dict[str, Any]]]]:
+        """
+        Execute configured pipeline for several benchmark entries at once.
+        
+        The entries advance through the pipeline together, so each generate or
+        verify step issues batched LLM calls covering every entry.
+        
+        Args:
+            config: Benchmark configuration
+            entries: Input data for each pipeline execution
             
-            # Execute pipeline and return results
-            self.pipeline_service.run_pipeline(configured_steps)
-            return self.pipeline_service.get_results()
+        Returns:
+            Pipeline results per entry (None where execution failed), in input order
+        """
+        # Each entry's data doubles as its global references for placeholder substitution,
+        # and its steps are configured with entry-specific data
+        requests = [
+            PipelineRequest(
+                steps=self._configure_steps(config.pipeline_steps, entry),
+                global_references=entry
+            )
+            for entry in entries
+        ]
+
+        try:
+            responses = self.pipeline_service.run_pipeline_batch(requests)
         except Exception as e:
-            logger.error(f"Pipeline execution failed: {str(e)}")
-            return None
+            logger.error("Pipeline execution failed: %s", e)
+            return [None] * len(entries)
+
+        return [response.step_results if response else None for response in responses]
 
     def _configure_steps(self, steps: List, entry: Dict) -> List:
         """
@@ -68,16 +99,16 @@ class BenchmarkService:
         Returns:
             List of configured pipeline steps
         """
-        configured_steps = []
+        # Shallow copies leave the original steps untouched; nested objects such
+        # as parse rules and verification methods are shared read-only. Steps the
+        # entry does not change are shared as they are, without any copy
+        configured = []
         for step in steps:
-            # Deep copy to prevent mutation of original steps
-            cloned_step = deepcopy(step)
-            # Inject entry data into step parameters
-            self._substitute_placeholders(cloned_step.parameters, entry)
-            configured_steps.append(cloned_step)
-        return configured_steps
+            parameters = self._substitute_placeholders(step.parameters, entry)
+            configured.append(step if parameters is step.parameters else replace(step, parameters=parameters))
+        return configured
 
-    def _substitute_placeholders(self, parameters: Any, data: Dict):
+    def _substitute_placeholders(self, parameters: Any, data: Dict) -> Any:
         """
         Replace placeholders in parameters with actual values from data.
         
@@ -85,18 +116,28 @@ class BenchmarkService:
         - system_prompt
         - user_prompt 
         - text
+        
+        Returns:
+            Copy of parameters with substituted values, or the same object if
+            no handled field has a placeholder for a key in data
         """
-        if hasattr(parameters, 'system_prompt'):
-            parameters.system_prompt = self._replace_in_template(parameters.system_prompt, data)
-        if hasattr(parameters, 'user_prompt'):
-            parameters.user_prompt = self._replace_in_template(parameters.user_prompt, data)
-        if hasattr(parameters, 'text'):
-            parameters.text = self._replace_in_template(parameters.text, data)
+        substituted = {}
+        for field_name in TEMPLATE_FIELDS:
+            template = getattr(parameters, field_name, None)
+            if template is None:
+                continue
+            parts = self._get_template_parts(template)
+            # Only fields naming at least one of the entry's keys change
+            if parts is not None and any(key in data for key, _, _ in parts[1]):
+                substituted[field_name] = self._render_parts(parts, data)
+        return replace(parameters, **substituted) if substituted else parameters
 
     def _replace_in_template(self, template: str, data: Dict) -> str:
         """
         Replace {placeholder} patterns in template with actual values.
         
+        Placeholders without a matching key in data are left untouched.
+        
         Args:
             template: String with {key} placeholders
             data: Dictionary of key-value replacements
@@ -104,51 +145,105 @@ class BenchmarkService:
         Returns:
             String with substituted values
         """
-        for key, value in data.items():
-            template = template.replace(f"{{{key}}}", str(value))
-        return template
+        parts = self._get_template_parts(template)
+        return template if parts is None else self._render_parts(parts, data)
 
-    def calculate_metrics(self, results: List[BenchmarkResult], label_value: str) -> BenchmarkMetrics:
+    @staticmethod
+    def _render_parts(parts: TemplateParts, data: Dict) -> str:
         """
-        Calculate performance metrics from benchmark results.
+        Render a split template in a single pass over its segments.
         
         Args:
-            results: Collected benchmark results
-            label_value: Positive class identifier
+            parts: Template split by _get_template_parts
+            data: Dictionary of key-value replacements
+            
+        Returns:
+            String with substituted values
+        """
+        # Only the placeholder slots vary per entry; literals and the text kept
+        # for missing keys are reused as is
+        head, segments = parts
+        pieces = [head]
+        for key, placeholder, literal in segments:
+            pieces.append(str(data[key]) if key in data else placeholder)
+            pieces.append(literal)
+        return "".join(pieces)
+
+    def _get_template_parts(self, template: str) -> Optional[TemplateParts]:
+        """
+        Get a template split into its literal text and placeholders.
+        
+        Templates come from the pipeline configuration, so each one is split
+        once and reused for every benchmark entry.
+        
+        Args:
+            template: String with {key} placeholders
+            
+        Returns:
+            (head, segments) where the template is head followed by, for each
+            (key, placeholder, literal) segment, the {key} placeholder and the
+            literal text after it; None if it has no placeholders
+        """
+        if "{" not in template:
+            return None
+        if template not in self._template_parts:
+            split = PLACEHOLDER_PATTERN.split(template)
+            self._template_parts[template] = (
+                split[0],
+                tuple((key, f"{{{key}}}", literal) for key, literal in zip(split[1::2], split[2::2]))
+            ) if len(split) > 1 else None
+        return self._template_parts[template]
+
+    @staticmethod
+    def create_confusion_matrix() -> List[int]:
+        """
+        Create an empty confusion matrix to accumulate results into.
+        
+        Cells are indexed by 2 * is_actual_positive + is_predicted_positive,
+        so each result updates a fixed slot without hashing outcome names.
+        
+        Returns:
+            List with every outcome counter set to zero
+        """
+        return [0] * len(CONFUSION_MATRIX_CELLS)
+
+    @staticmethod
+    def record_outcome(confusion_matrix: List[int], is_actual_positive: bool, is_predicted_positive: bool) -> bool:
+        """
+        Count a single benchmark outcome as soon as it is available.
+        
+        Args:
+            confusion_matrix: Counters updated in place
+            is_actual_positive: Whether the expected label is the positive class
+            is_predicted_positive: Whether the pipeline confirmed the entry
+            
+        Returns:
+            True if the entry was misclassified
+        """
+        confusion_matrix[2 * is_actual_positive + is_predicted_positive] += 1
+        return is_actual_positive != is_predicted_positive
+
+    @staticmethod
+    def calculate_metrics(counts: List[int], misclassified: List[BenchmarkResult]) -> BenchmarkMetrics:
+        """
+        Calculate performance metrics from accumulated benchmark results.
+        
+        Args:
+            counts: Confusion matrix cells filled by record_outcome
+            misclassified: Incorrectly predicted cases
             
         Returns:
             BenchmarkMetrics: Calculated performance metrics
         """
-        # Initialize confusion matrix counters
+        # Cells are unpacked once; every metric below is computed from the locals
+        true_negative, false_positive, false_negative, true_positive = counts
         confusion_matrix = {
-            "true_positive": 0,
-            "false_positive": 0,
-            "true_negative": 0,
-            "false_negative": 0
+            "true_positive": true_positive,
+            "false_positive": false_positive,
+            "true_negative": true_negative,
+            "false_negative": false_negative
         }
-        misclassified = []
-        
-        # Categorize each result
-        for result in results:
-            actual = result.actual_label
-            predicted = result.predicted_label
-            
-            is_actual_positive = (actual == label_value)
-            is_predicted_positive = (predicted == "confirmed")
-
-            # Update confusion matrix
-            if is_actual_positive and is_predicted_positive:
-                confusion_matrix["true_positive"] += 1
-            elif not is_actual_positive and not is_predicted_positive:
-                confusion_matrix["true_negative"] += 1
-            elif is_actual_positive and not is_predicted_positive:
-                confusion_matrix["false_negative"] += 1
-                misclassified.append(result)
-            else:
-                confusion_matrix["false_positive"] += 1
-                misclassified.append(result)
-
-        total = len(results)
+        total = true_negative + false_positive + false_negative + true_positive
 
         # Handle empty results case
         if total == 0:
@@ -162,9 +257,9 @@ class BenchmarkService:
             )
         
         # Calculate metrics with smoothing to avoid division by zero
-        accuracy = (confusion_matrix["true_positive"] + confusion_matrix["true_negative"]) / total
-        precision = confusion_matrix["true_positive"] / (confusion_matrix["true_positive"] + confusion_matrix["false_positive"] + 1e-10)
-        recall = confusion_matrix["true_positive"] / (confusion_matrix["true_positive"] + confusion_matrix["false_negative"] + 1e-10)
+        accuracy = (true_positive + true_negative) / total
+        precision = true_positive / (true_positive + false_positive + 1e-10)
+        recall = true_positive / (true_positive + false_negative + 1e-10)
         f1 = 2 * (precision * recall) / (precision + recall + 1e-10)
 
         return BenchmarkMetrics(
@@ -174,4 +269,4 @@ class BenchmarkService:
             f1_score=f1,
             confusion_matrix=confusion_matrix,
             misclassified=misclassified
-        )
\ No newline at end of file
+        )
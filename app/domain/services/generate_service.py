@@ -1,15 +1,52 @@
 # domain/services/generate_service.py
 
+import copy
+import hashlib
+import json
 import logging
-import re
-from typing import List
-import torch
-from transformers import AutoModelForCausalLM, AutoTokenizer
+import threading
+import time
+import weakref
+from collections import OrderedDict
 from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Tuple
+import torch
+from transformers import AutoModelForCausalLM, AutoTokenizer, StoppingCriteria, StoppingCriteriaList
 from domain.model.entities.generation import GeneratedResult, GenerationMetadata
 
 logger = logging.getLogger(__name__)
 
+# Stands in for the user prompt when a chat template is rendered once per system
+# prompt; the surrounding newlines reveal templates that strip message content
+USER_PROMPT_SENTINEL = "\n<<user_prompt>>\n"
+# System prompts filled per entry would grow the rendered template cache without
+# bound, so it is emptied once it holds this many system prompts
+CHAT_TEMPLATE_CACHE_SIZE = 1024
+# Maximum number of prompts whose greedy (temperature 0) results are kept; only
+# deterministic generations can be reused for a repeated prompt
+GREEDY_CACHE_SIZE = 4096
+
+class _StopOnTexts(StoppingCriteria):
+    """
+    Finishes each sequence once its generated text contains one of its stop texts.
+
+    Matching is case-insensitive. Only the tokens generated so far are decoded,
+    and rows without stop texts run until EOS or the token limit as usual.
+    """
+
+    def __init__(self, tokenizer, input_length: int, row_stop_texts: List[Sequence[str]]):
+        self.tokenizer = tokenizer
+        self.input_length = input_length
+        self.row_stop_texts = [[text.lower() for text in texts] for texts in row_stop_texts]
+
+    def __call__(self, input_ids: torch.LongTensor, scores: torch.FloatTensor, **kwargs) -> torch.BoolTensor:
+        generated = self.tokenizer.batch_decode(input_ids[:, self.input_length:], skip_special_tokens=True)
+        return torch.tensor(
+            [any(text in output.lower() for text in texts) for output, texts in zip(generated, self.row_stop_texts)],
+            dtype=torch.bool,
+            device=input_ids.device
+        )
+
 class GenerateService:
     """
     Text generation service using Hugging Face Transformers models.
@@ -24,27 +61,50 @@ class GenerateService:
     Supports both base models and instruction-tuned models.
     """
 
-    def __init__(self, model_name):
+    def __init__(self, model_name, max_batch_size: int = 16):
         """
         Initialize text generation service.
 
         Args:
             model_name: Hugging Face model identifier or local path
+            max_batch_size: Maximum number of prompts sent to the model in one
+                            forward pass by generate_batch
 
         Raises:
             Exception: If model loading fails
         """
-        logger.info(f"Initializing generator with model '{model_name}'.")
+        logger.info("Initializing generator with model '%s'.", model_name)
         self.model_name = model_name
+        self.max_batch_size = max_batch_size
         self.device = 'cuda' if torch.cuda.is_available() else 'cpu'
         self.instruct_mode = "instruct" in model_name.lower()  # Detect instruction-tuned models
+        # Chat template rendered around each system prompt, keyed by system prompt;
+        # None when the template cannot be split around the user prompt
+        self._chat_templates: Dict[str, Optional[Tuple[str, str]]] = {}
+        # LRU cache of greedy results by prompt digest; the service is shared by
+        # pipeline steps running in worker threads
+        self._greedy_cache: "OrderedDict[bytes, List[GeneratedResult]]" = OrderedDict()
+        self._greedy_cache_lock = threading.Lock()
+        # The service is shared by concurrent benchmark and pipeline threads, but
+        # the fast tokenizer mutates its padding state on every call and the chat
+        # template cache is a plain dict; one chunk at a time also bounds GPU memory
+        self._model_lock = threading.Lock()
 
         try:
             # Initialize tokenizer and model
             self.tokenizer = AutoTokenizer.from_pretrained(model_name)
-            self.model = AutoModelForCausalLM.from_pretrained(model_name)
+            # Batched decoder-only generation needs left padding and a pad token
+            self.tokenizer.padding_side = "left"
+            if self.tokenizer.pad_token is None:
+                self.tokenizer.pad_token = self.tokenizer.eos_token
+            # Decoding is bound by reading the weights, so GPUs load them in half
+            # precision (bfloat16 where supported); CPUs keep the default float32
+            self.model = AutoModelForCausalLM.from_pretrained(model_name, torch_dtype=self._model_dtype())
             self.model.to(self.device)  # Move model to appropriate device
-            logger.info(f"Successfully loaded model on {self.device.upper()}")
+            self.model.eval()
+            # Set once instead of passing it with every generate call
+            self.model.generation_config.pad_token_id = self.tokenizer.pad_token_id
+            logger.info("Successfully loaded model on %s", self.device.upper())
         except Exception as e:
             logger.exception("Model loading failed")
             raise RuntimeError(f"Could not load model {model_name}") from e
@@ -73,43 +133,271 @@ class GenerateService:
         Raises:
             Exception: If generation fails
         """
-        logger.debug(f"Generating with system prompt: {system_prompt[:50]}...")
-        start_time = datetime.now()
+        return self.generate_batch(
+            [(system_prompt, user_prompt)],
+            num_sequences=num_sequences,
+            max_tokens=max_tokens,
+            temperature=temperature
+        )[0]
+
+    def generate_batch(
+        self,
+        prompts: List[Tuple[str, str]],
+        num_sequences: int = 1,
+        max_tokens: int = 100,
+        temperature: float = 1.0,
+        stop_texts: Optional[List[Sequence[str]]] = None
+    ) -> List[List[GeneratedResult]]:
+        """
+        Generate text sequences for several prompt pairs using padded batches.
+
+        Prompts are sent to the model in chunks of at most `max_batch_size`
+        so that a single forward pass serves many prompts.
+
+        Args:
+            prompts: (system_prompt, user_prompt) pairs to generate for
+            num_sequences: Number of variations to generate per prompt pair
+            max_tokens: Maximum length of generated text
+            temperature: Sampling randomness (0.0=deterministic, 1.0=default)
+            stop_texts: Optional texts per prompt pair; a sequence stops as soon
+                        as its text contains one of them (case-insensitive)
+
+        Returns:
+            List[List[GeneratedResult]]: Generated sequences for each prompt pair,
+            in the same order as `prompts`
+
+        Raises:
+            Exception: If generation fails
+        """
+        if temperature <= 0:
+            return self._generate_greedy(prompts, num_sequences, max_tokens, stop_texts)
+        return self._generate_chunks(prompts, num_sequences, max_tokens, temperature, stop_texts)
+
+    def _generate_chunks(
+        self,
+        prompts: List[Tuple[str, str]],
+        num_sequences: int,
+        max_tokens: int,
+        temperature: float,
+        stop_texts: Optional[List[Sequence[str]]] = None
+    ) -> List[List[GeneratedResult]]:
+        """Generate for prompt pairs in chunks of at most `max_batch_size`, one chunk at a time."""
+        results = []
+        for offset in range(0, len(prompts), self.max_batch_size):
+            with self._model_lock:
+                results.extend(self._generate_chunk(
+                    prompts[offset:offset + self.max_batch_size],
+                    num_sequences,
+                    max_tokens,
+                    temperature,
+                    stop_texts[offset:offset + self.max_batch_size] if stop_texts else None
+                ))
+        return results
+
+    def _generate_greedy(
+        self,
+        prompts: List[Tuple[str, str]],
+        num_sequences: int,
+        max_tokens: int,
+        stop_texts: Optional[List[Sequence[str]]] = None
+    ) -> List[List[GeneratedResult]]:
+        """
+        Generate deterministically, reusing the results of prompts seen before.
+
+        Greedy decoding always yields the same text for the same prompt, so
+        repeated prompts are served from the cache and duplicates within the
+        call are generated once. Callers receive copies, since results are
+        annotated after generation.
+        """
+        keys = [
+            self._greedy_cache_key(system_prompt, user_prompt, num_sequences, max_tokens,
+                                   stop_texts[index] if stop_texts else ())
+            for index, (system_prompt, user_prompt) in enumerate(prompts)
+        ]
+        with self._greedy_cache_lock:
+            cached = [self._greedy_cache_lookup(key) for key in keys]
+
+        # First index of every distinct prompt missing from the cache
+        pending: Dict[bytes, int] = {}
+        for index, (key, results) in enumerate(zip(keys, cached)):
+            if results is None:
+                pending.setdefault(key, index)
+
+        if pending:
+            logger.debug("Greedy cache: %d hit(s), %d prompt(s) to generate", len(keys) - len(pending), len(pending))
+            generated = dict(zip(
+                pending,
+                self._generate_chunks(
+                    [prompts[index] for index in pending.values()],
+                    num_sequences,
+                    max_tokens,
+                    0.0,
+                    [stop_texts[index] for index in pending.values()] if stop_texts else None
+                )
+            ))
+            with self._greedy_cache_lock:
+                for key, results in generated.items():
+                    self._greedy_cache[key] = results
+                    if len(self._greedy_cache) > GREEDY_CACHE_SIZE:
+                        self._greedy_cache.popitem(last=False)
+            cached = [generated[key] if results is None else results for key, results in zip(keys, cached)]
+
+        return [copy.deepcopy(results) for results in cached]
+
+    @staticmethod
+    def _greedy_cache_key(system_prompt: str, user_prompt: str, num_sequences: int, max_tokens: int,
+                          stop_texts: Sequence[str]) -> bytes:
+        """16-byte digest identifying a greedy generation request."""
+        request = json.dumps([system_prompt, user_prompt, num_sequences, max_tokens, list(stop_texts)])
+        return hashlib.blake2b(request.encode("utf-8"), digest_size=16).digest()
+
+    def _greedy_cache_lookup(self, key: bytes) -> Optional[List[GeneratedResult]]:
+        """Returns the cached results for key, marking them recently used. Caller holds the lock."""
+        results = self._greedy_cache.get(key)
+        if results is not None:
+            self._greedy_cache.move_to_end(key)
+        return results
+
+    def _generate_chunk(
+        self,
+        prompts: List[Tuple[str, str]],
+        num_sequences: int,
+        max_tokens: int,
+        temperature: float,
+        stop_texts: Optional[List[Sequence[str]]] = None
+    ) -> List[List[GeneratedResult]]:
+        """Run one padded forward pass for a chunk of prompt pairs. Caller holds the model lock."""
+        logger.debug("Generating for %d prompt(s), first system prompt: %.50s...", len(prompts), prompts[0][0])
+        start_ns = time.perf_counter_ns()
         
         try:
-            # Format prompt based on model type
-            if self.instruct_mode:
-                messages = [
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt},
-                ]
-                prompt = self.tokenizer.apply_chat_template(
-                    messages,
-                    tokenize=False,
-                    add_generation_prompt=True
-                )
-            else:
-                prompt = f"{system_prompt}\n{user_prompt}"
+            # Format prompts based on model type
+            formatted_prompts = [
+                self._format_prompt(system_prompt, user_prompt)
+                for system_prompt, user_prompt in prompts
+            ]
+
+            # Temperature 0 selects greedy decoding, whose sequences for a prompt are
+            # all the same, so a single one is generated and repeated below
+            sampled = temperature > 0
+            generation_options = {"do_sample": True, "temperature": temperature} if sampled else {"do_sample": False}
 
             # Tokenize and generate
-            inputs = self.tokenizer([prompt], return_tensors="pt").to(self.device)
-            outputs = self.model.generate(
-                **inputs,
-                max_new_tokens=max_tokens,
-                num_return_sequences=num_sequences,
-                do_sample=True,
-                temperature=temperature,
-                pad_token_id=self.tokenizer.eos_token_id
-            )
+            inputs = self.tokenizer(formatted_prompts, return_tensors="pt", padding=True).to(self.device)
+            input_length = inputs["input_ids"].shape[1]
+            if stop_texts:
+                # Output rows hold the sequences of each prompt contiguously
+                rows_per_prompt = num_sequences if sampled else 1
+                generation_options["stopping_criteria"] = StoppingCriteriaList([_StopOnTexts(
+                    self.tokenizer,
+                    input_length,
+                    [texts for texts in stop_texts for _ in range(rows_per_prompt)]
+                )])
+
+            # No gradients are ever needed, so autograd tracking is skipped entirely
+            with torch.inference_mode():
+                outputs = self.model.generate(
+                    **inputs,
+                    max_new_tokens=max_tokens,
+                    num_return_sequences=num_sequences if sampled else 1,
+                    use_cache=True,
+                    **generation_options
+                )
+
+            # Inputs are left padded to a shared length, so the generated tokens of
+            # every row start at the same column; the sequences of each prompt are
+            # contiguous rows
+            new_tokens = outputs[:, input_length:]
+
+            # Only the generated tokens are decoded, so the prompt never has to be
+            # located in (and trimmed from) the decoded text
+            decoded_outputs = self.tokenizer.batch_decode(new_tokens, skip_special_tokens=True)
 
-            # Process outputs
-            decoded_outputs = self.tokenizer.batch_decode(outputs, skip_special_tokens=True)
-            return self._create_results(decoded_outputs, prompt, system_prompt, user_prompt, temperature, start_time)
+            # Count the new tokens of every row in one tensor operation instead of
+            # re-encoding each decoded text
+            token_counts = (new_tokens != self.tokenizer.pad_token_id).sum(dim=1).tolist()
+            if not sampled:
+                decoded_outputs = [text for text in decoded_outputs for _ in range(num_sequences)]
+                token_counts = [count for count in token_counts for _ in range(num_sequences)]
+
+            # Every sequence of the chunk comes out of the same forward pass, so
+            # they share one duration and completion time
+            generation_time = (time.perf_counter_ns() - start_ns) / 1e9
+            finished_at = datetime.now()
+
+            return [
+                self._create_results(
+                    decoded_outputs[index * num_sequences:(index + 1) * num_sequences],
+                    token_counts[index * num_sequences:(index + 1) * num_sequences],
+                    system_prompt,
+                    user_prompt,
+                    temperature,
+                    generation_time,
+                    finished_at
+                )
+                for index, (system_prompt, user_prompt) in enumerate(prompts)
+            ]
 
         except Exception as e:
             logger.exception("Generation failed")
             raise
 
+    def _model_dtype(self) -> Optional[torch.dtype]:
+        """Weight precision for the model: half precision on GPU, the checkpoint default on CPU."""
+        if self.device != 'cuda':
+            return None
+        return torch.bfloat16 if torch.cuda.is_bf16_supported() else torch.float16
+
+    def _format_prompt(self, system_prompt: str, user_prompt: str) -> str:
+        """Build the model input text, using the chat template for instruct models."""
+        if not self.instruct_mode:
+            return f"{system_prompt}\n{user_prompt}"
+
+        # The same system prompt is sent with every entry, so the template is
+        # rendered once per system prompt and only the user prompt is spliced in
+        template = self._get_chat_template(system_prompt)
+        if template is not None:
+            prefix, suffix = template
+            return f"{prefix}{user_prompt}{suffix}"
+        return self._render_chat_template(system_prompt, user_prompt)
+
+    def _get_chat_template(self, system_prompt: str) -> Optional[Tuple[str, str]]:
+        """
+        Get the chat template rendered for a system prompt, split around the user prompt.
+
+        Args:
+            system_prompt: Context/instructions for the model
+
+        Returns:
+            (prefix, suffix) surrounding the user prompt, or None if the template
+            alters the user content and must be rendered for every prompt
+        """
+        if system_prompt not in self._chat_templates:
+            if len(self._chat_templates) >= CHAT_TEMPLATE_CACHE_SIZE:
+                self._chat_templates.clear()
+            rendered = self._render_chat_template(system_prompt, USER_PROMPT_SENTINEL)
+            parts = rendered.split(USER_PROMPT_SENTINEL)
+            self._chat_templates[system_prompt] = (parts[0], parts[1]) if len(parts) == 2 else None
+            if logger.isEnabledFor(logging.DEBUG):
+                # Digest of (model, system prompt) so repeated prefixes can be traced in logs
+                logger.debug(
+                    "Rendered chat template for system prompt %s",
+                    hashlib.blake2b(f"{self.model_name}\0{system_prompt}".encode(), digest_size=8).hexdigest()
+                )
+        return self._chat_templates[system_prompt]
+
+    def _render_chat_template(self, system_prompt: str, user_prompt: str) -> str:
+        """Render the tokenizer's chat template for a system/user message pair."""
+        messages = [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_prompt},
+        ]
+        return self.tokenizer.apply_chat_template(
+            messages,
+            tokenize=False,
+            add_generation_prompt=True
+        )
+
     def get_token_count(self, text: str) -> int:
         """
         Calculate token count for a given text string.
@@ -124,46 +412,56 @@ class GenerateService:
             Exception: If tokenization fails
         """
         try:
-            return len(self.tokenizer.encode(text))
+            with self._model_lock:
+                return len(self.tokenizer.encode(text))
         except Exception as e:
             logger.exception("Token counting error")
             raise
 
-    def _create_results(self, outputs: List[str], prompt: str, system_prompt: str,
-                       user_prompt: str, temperature: float, start_time: datetime) -> List[GeneratedResult]:
-        """Package raw outputs into GeneratedResult objects with metadata."""
+    def _create_results(self, outputs: List[str], token_counts: List[int], system_prompt: str,
+                       user_prompt: str, temperature: float, generation_time: float,
+                       finished_at: datetime) -> List[GeneratedResult]:
+        """Package raw outputs and their generated token counts into GeneratedResult objects with metadata."""
         results = []
-        for output in outputs:
-            content = self._process_output(output, prompt)
+        for output, tokens_used in zip(outputs, token_counts):
             metadata = GenerationMetadata(
                 model_name=self.model_name,
                 system_prompt=system_prompt,
                 user_prompt=user_prompt,
                 temperature=temperature,
-                tokens_used=len(self.tokenizer.encode(content)),
-                generation_time=(datetime.now() - start_time).total_seconds()
+                tokens_used=tokens_used,
+                generation_time=generation_time,
+                timestamp=finished_at
             )
-            results.append(GeneratedResult(content=content.strip(), metadata=metadata))
-        logger.debug(f"Generated {len(results)} sequences")
+            results.append(GeneratedResult(content=output.strip(), metadata=metadata))
+        logger.debug("Generated %d sequences", len(results))
         return results
 
-    def _extract_assistant_response(self, text: str) -> str:
-        """
-        Extract assistant's response from instruction-formatted text.
-        
-        Uses pattern matching to find content after 'assistant' marker.
-        """
-        match = re.search(r"assistant\n(.*)", text, re.DOTALL)
-        return match.group(1).strip() if match else text.strip()
 
-    def _trim_response(self, prompt: str, output: str) -> str:
-        """
-        Remove prompt text from generated output.
-        
-        Handles cases where model doesn't exactly reproduce prompt.
-        """
-        return output[len(prompt):].strip() if output.startswith(prompt) else output.strip()
+# Loaded services by model name. Entries are weak, so a model stays loaded
+# exactly as long as some service or use case still holds it
+_generate_services: "weakref.WeakValueDictionary[str, GenerateService]" = weakref.WeakValueDictionary()
+_generate_services_lock = threading.Lock()
+
+
+def get_generate_service(model_name: str) -> GenerateService:
+    """
+    Returns a shared GenerateService for a model, loading its weights only once.
+
+    Generation, verification and pipeline services built in the same process
+    share the loaded model instead of each reading it from disk again, for as
+    long as any of them holds it.
+
+    Args:
+        model_name: Hugging Face model identifier or local path
+
+    Returns:
+        The GenerateService loaded for this model.
+    """
+    with _generate_services_lock:
+        service = _generate_services.get(model_name)
+        if service is None:
+            service = GenerateService(model_name)
+            _generate_services[model_name] = service
+        return service
 
-    def _process_output(self, output: str, prompt: str) -> str:
-        """Select appropriate processing method based on model type."""
-        return self._extract_assistant_response(output) if self.instruct_mode else self._trim_response(prompt, output)
\ No newline at end of file
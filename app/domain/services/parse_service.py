@@ -1,18 +1,92 @@
 # domain/services/parse_service.py
 
 import logging
-import re
-from typing import List, Dict, Optional, Literal
-from domain.model.entities.parsing import ParseResult, ParseRule, ParseMode
+import multiprocessing
+import os
+import threading
+from bisect import bisect_left
+from concurrent.futures import ProcessPoolExecutor
+from operator import itemgetter
+from typing import List, Dict, Optional, Literal, Set
+from domain.model.entities.parsing import (
+    ParseResult, ParseRule, ParseMode, compile_keyword_automaton, compile_pattern_set
+)
 
 logger = logging.getLogger(__name__)
 
+# Minimum number of texts parsed with the same rules before the work is spread
+# over worker processes; below it, starting the workers costs more than it saves
+PARALLEL_PARSE_MIN_TEXTS = 256
+# Texts sent to a worker process per task, so rules are pickled once per chunk
+PARSE_CHUNK_SIZE = 64
+
+def _parse_chunk(texts: List[str], rules: List[ParseRule],
+                 filter_type: Literal["all", "successful", "first_n"],
+                 n: Optional[int]) -> List[ParseResult]:
+    """Parses and filters a chunk of texts; runs inside a worker process."""
+    return ParseService().parse_texts(texts, rules, filter_type, n)
+
 class ParseService:
     """
     Text parsing service implementing rule-based extraction.
     Handles both regex patterns and keyword-based extraction with boundary detection.
     """
 
+    def __init__(self, max_workers: Optional[int] = None):
+        """
+        Initializes the parser.
+        
+        Args:
+            max_workers: Worker processes used by parse_texts for large inputs.
+                         Defaults to the number of CPUs; 1 disables them.
+        """
+        self.max_workers = max_workers or os.cpu_count() or 1
+        # Started on the first large parse_texts call and kept for later ones
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+
+    def parse_texts(self, texts: List[str], rules: List[ParseRule],
+                    filter_type: Literal["all", "successful", "first_n"] = "all",
+                    n: Optional[int] = None) -> List[ParseResult]:
+        """
+        Parses and filters several texts with the same rules.
+        
+        Regex matching holds the GIL, so from PARALLEL_PARSE_MIN_TEXTS texts on
+        the work is split in chunks across worker processes.
+        
+        Args:
+            texts: Input texts to parse
+            rules: Ordered list of parsing rules to apply
+            filter_type: Filtering strategy applied to each result
+            n: Required for 'first_n' filter type
+            
+        Returns:
+            A filtered ParseResult per text, in the order of `texts`
+        """
+        if len(texts) < PARALLEL_PARSE_MIN_TEXTS or self.max_workers < 2:
+            return [
+                self.filter_entries(self.parse_text(text, rules), filter_type, n, rules)
+                for text in texts
+            ]
+
+        logger.debug("Parsing %d texts in worker processes", len(texts))
+        chunks = [texts[offset:offset + PARSE_CHUNK_SIZE] for offset in range(0, len(texts), PARSE_CHUNK_SIZE)]
+        executor = self._get_executor()
+        futures = [executor.submit(_parse_chunk, chunk, rules, filter_type, n) for chunk in chunks]
+        return [result for future in futures for result in future.result()]
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """Returns the worker process pool, starting it on first use."""
+        with self._executor_lock:
+            if self._executor is None:
+                # Spawned workers only import the parsing modules; forking would
+                # copy loaded models and the threads of the calling process
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+            return self._executor
+
     def parse_text(self, text: str, rules: List[ParseRule]) -> ParseResult:
         """
         Main parsing method that processes text through multiple rule-based stages.
@@ -26,48 +100,55 @@ class ParseService:
         """
         logger.debug("Starting text parsing process")
         
-        # Stage 1: Find all rule matches in text
+        # Stage 1: Find all rule matches in text, as (start, rule_idx, value) records
+        skipped_rules = self._rules_without_matches(text, rules)
+        keyword_positions = self._find_keyword_positions(text, rules)
         all_matches = []
         for rule_idx, rule in enumerate(rules):
+            if rule_idx in skipped_rules:
+                continue
             # Get matches for current rule
-            occurrences = self._find_all_occurrences(text, rule)
-            for (start, end, matched_str) in occurrences:
-                all_matches.append({
-                    "start": start,
-                    "end": end,
-                    "rule_idx": rule_idx,
-                    "rule_name": rule.name,
-                    "value": matched_str
-                })
+            if rule.mode == ParseMode.REGEX:
+                # Records are built straight from the match objects, skipping the
+                # intermediate (start, end, value) tuples
+                logger.debug("Processing rule: %s (%s)", rule.name, rule.mode)
+                all_matches.extend(
+                    (match.start(), rule_idx, match.group().strip())
+                    for match in rule.compiled_pattern.finditer(text)
+                )
+            else:
+                occurrences = self._find_all_occurrences(text, rule, keyword_positions)
+                all_matches.extend((start, rule_idx, matched_str) for (start, _, matched_str) in occurrences)
 
         # Stage 2: Sort matches by position and rule order
-        all_matches.sort(key=lambda x: (x["start"], x["rule_idx"]))
+        all_matches.sort(key=itemgetter(0, 1))
 
-        # Stage 3: Build structured entries from matches
+        # Stage 3: Build structured entries from matches. Rule names and missing
+        # values are resolved once per text, not once per match or entry
+        rule_names = [rule.name for rule in rules]
+        missing_values = [(rule.name, rule.missing_value) for rule in rules]
         entries: List[Dict[str, str]] = []
+        # The keys of the entry being built are the rules matched in it
         current_entry: Dict[str, str] = {}
-        rules_matched_in_entry = set()
         expected_rule_index = 0  # Tracks expected rule order
 
         def finalize_current_entry():
             """Complete current entry by adding fallback values for missing rules"""
-            for rule in rules:
-                if rule.name not in rules_matched_in_entry:
+            nonlocal current_entry
+            for rule_name, missing_value in missing_values:
+                if rule_name not in current_entry:
                     # Use fallback value or default missing indicator
-                    fallback = rule.fallback_value or f"missing_{rule.name}"
-                    current_entry[rule.name] = fallback
-            entries.append(dict(current_entry))
-            current_entry.clear()
-            rules_matched_in_entry.clear()
+                    current_entry[rule_name] = missing_value
+            # The finished dict is stored as is and a fresh one is started
+            entries.append(current_entry)
+            current_entry = {}
 
         # Process each match to build coherent entries
-        for match_info in all_matches:
-            rule_idx = match_info["rule_idx"]
-            rule_name = match_info["rule_name"]
-            matched_str = match_info["value"]
+        for _, rule_idx, matched_str in all_matches:
+            rule_name = rule_names[rule_idx]
 
             # Case 1: Duplicate rule in current entry
-            if rule_name in rules_matched_in_entry:
+            if rule_name in current_entry:
                 finalize_current_entry()
                 expected_rule_index = 0
 
@@ -79,64 +160,144 @@ class ParseService:
             # Case 3: Expected rule in sequence
             if rule_idx == expected_rule_index:
                 current_entry[rule_name] = matched_str
-                rules_matched_in_entry.add(rule_name)
                 expected_rule_index += 1
                 
             # Case 4: Rule appears after expected position
             elif rule_idx > expected_rule_index:
                 # Fill missing rules with fallbacks
-                for missing_idx in range(expected_rule_index, rule_idx):
-                    missing_rule = rules[missing_idx]
-                    fallback = missing_rule.fallback_value or f"missing_{missing_rule.name}"
-                    current_entry[missing_rule.name] = fallback
-                    rules_matched_in_entry.add(missing_rule.name)
+                for missing_name, missing_value in missing_values[expected_rule_index:rule_idx]:
+                    current_entry[missing_name] = missing_value
                 
                 current_entry[rule_name] = matched_str
-                rules_matched_in_entry.add(rule_name)
                 finalize_current_entry()
                 expected_rule_index = 0
 
         # Finalize any remaining partial entry
-        if rules_matched_in_entry:
+        if current_entry:
             finalize_current_entry()
 
-        logger.debug(f"Parsing completed with {len(entries)} entries")
+        logger.debug("Parsing completed with %d entries", len(entries))
         return ParseResult(entries=entries)
 
-    def _find_all_occurrences(self, text: str, rule: ParseRule) -> List[tuple]:
+    def _rules_without_matches(self, text: str, rules: List[ParseRule]) -> Set[int]:
+        """
+        Finds the REGEX rules that cannot match text, using one pass over it.
+        
+        The patterns of the rules that use the RE2 engine are matched together
+        as an RE2 set; rules outside the reported matches are skipped instead
+        of being scanned one by one. Rules using re are never prefiltered,
+        since RE2 could miss their non-ASCII matches.
+        
+        Returns:
+            Indices of rules known not to match (empty when RE2 is unavailable)
+        """
+        regex_indices = [
+            rule_idx for rule_idx, rule in enumerate(rules)
+            if rule.mode == ParseMode.REGEX and rule.regex_engine == "re2"
+        ]
+        pattern_set = compile_pattern_set(tuple(rules[rule_idx].pattern for rule_idx in regex_indices))
+        if pattern_set is None:
+            return set()
+
+        # Match returns None instead of an empty list when nothing matches
+        matched = {regex_indices[position] for position in pattern_set.Match(text) or ()}
+        return set(regex_indices) - matched
+
+    def _find_keyword_positions(self, text: str, rules: List[ParseRule]) -> Optional[Dict[str, List[int]]]:
+        """
+        Locates every keyword and secondary pattern of the KEYWORD rules in one pass.
+        
+        All of them are matched together with an Aho-Corasick automaton, so
+        the text is swept once instead of once per keyword and occurrence.
+        
+        Returns:
+            Sorted start positions of each keyword found (overlapping
+            occurrences included), or None when the automaton is unavailable
+        """
+        keywords = tuple(
+            keyword
+            for rule in rules if rule.mode == ParseMode.KEYWORD
+            for keyword in (rule.pattern, rule.secondary_pattern) if keyword
+        )
+        automaton = compile_keyword_automaton(keywords)
+        if automaton is None:
+            return None
+
+        # Matches are reported by increasing end index, so each keyword's start
+        # positions come out sorted
+        positions: Dict[str, List[int]] = {}
+        for end_index, keyword in automaton.iter(text):
+            positions.setdefault(keyword, []).append(end_index - len(keyword) + 1)
+        return positions
+
+    def _find_all_occurrences(self, text: str, rule: ParseRule,
+                              keyword_positions: Optional[Dict[str, List[int]]] = None) -> List[tuple]:
         """
         Find all occurrences of a rule's pattern in the text.
         
+        Args:
+            keyword_positions: Optional result of _find_keyword_positions for
+                the text, used by KEYWORD rules instead of searching the text
+        
         Returns list of tuples containing:
         (start_index, end_index, matched_string)
         """
-        logger.debug(f"Processing rule: {rule.name} ({rule.mode})")
+        logger.debug("Processing rule: %s (%s)", rule.name, rule.mode)
         results = []
 
         if rule.mode == ParseMode.REGEX:
             # Regex pattern matching with full capture
-            for match in re.finditer(rule.pattern, text):
+            for match in rule.compiled_pattern.finditer(text):
                 results.append((
                     match.start(), 
                     match.end(),
                     match.group().strip()
                 ))
                 
+        elif rule.mode == ParseMode.KEYWORD and keyword_positions is not None:
+            # Same walk as below, over the positions found by the automaton: the
+            # next keyword at or after start, bounded by the next secondary pattern
+            keyword_starts = keyword_positions.get(rule.pattern, [])
+            boundary_starts = keyword_positions.get(rule.secondary_pattern, []) if rule.secondary_pattern else []
+            keyword_length = len(rule.pattern)
+            text_length = len(text)
+            index = 0
+            start = 0
+            while True:
+                index = bisect_left(keyword_starts, start, index)
+                if index == len(keyword_starts):
+                    break
+                key_pos = keyword_starts[index]
+                segment_start = key_pos + keyword_length
+                segment_end = text_length
+                
+                boundary_index = bisect_left(boundary_starts, segment_start)
+                if boundary_index < len(boundary_starts):
+                    segment_end = boundary_starts[boundary_index]
+                
+                results.append((key_pos, segment_end, text[segment_start:segment_end].strip()))
+                start = segment_end + 1
+
         elif rule.mode == ParseMode.KEYWORD:
-            # Keyword-based extraction with boundary detection
+            # Keyword-based extraction with boundary detection; the loop invariants
+            # are read once instead of once per occurrence
+            keyword = rule.pattern
+            keyword_length = len(keyword)
+            secondary_pattern = rule.secondary_pattern
+            text_length = len(text)
             start = 0
             while True:
-                key_pos = text.find(rule.pattern, start)
+                key_pos = text.find(keyword, start)
                 if key_pos == -1:
                     break
                 
                 # Calculate extraction boundaries
-                segment_start = key_pos + len(rule.pattern)
-                segment_end = len(text)
+                segment_start = key_pos + keyword_length
+                segment_end = text_length
                 
                 # Use secondary pattern as end boundary if available
-                if rule.secondary_pattern:
-                    end_pos = text.find(rule.secondary_pattern, segment_start)
+                if secondary_pattern:
+                    end_pos = text.find(secondary_pattern, segment_start)
                     if end_pos != -1:
                         segment_end = end_pos
                 
@@ -169,16 +330,11 @@ class ParseService:
             
         if filter_type == "successful":
             # Only include entries where all rules succeeded
-            filtered = []
-            for entry in parse_result.entries:
-                valid = True
-                for rule in rules:
-                    fallback = rule.fallback_value or f"missing_{rule.name}"
-                    if entry.get(rule.name, "") == fallback:
-                        valid = False
-                        break
-                if valid:
-                    filtered.append(entry)
+            fallbacks = [(rule.name, rule.missing_value) for rule in rules]
+            filtered = [
+                entry for entry in parse_result.entries
+                if all(entry.get(name, "") != fallback for name, fallback in fallbacks)
+            ]
             return ParseResult(entries=filtered)
             
         if filter_type == "first_n" and n is not None:
@@ -1,21 +1,39 @@
 # domain/services/pipeline_service.py
 
-from typing import Any, Dict, List, Optional, Set, Tuple
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
 import re
+import copy
 import logging
 import itertools
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from types import MappingProxyType
 
-from domain.model.entities.pipeline import PipelineStep
+from domain.model.entities.pipeline import PipelineRequest, PipelineResponse, PipelineStep
 from domain.model.entities.generation import GenerateTextRequest, GeneratedResult
 from domain.model.entities.parsing import ParseRequest, ParseResult
 from domain.model.entities.verification import VerificationMethod, VerificationSummary, VerifyRequest
 
 from domain.services.parse_service import ParseService
 from domain.services.verifier_service import VerifierService
-from domain.services.generate_service import GenerateService
+from domain.services.generate_service import GenerateService, get_generate_service
 
 logger = logging.getLogger(__name__)
 
+PLACEHOLDER_PATTERN = re.compile(r"{([^{}]+)}")
+NO_PLACEHOLDERS: FrozenSet[str] = frozenset()
+
+# Step types whose results provide to_dict()
+SERIALIZABLE_STEP_TYPES = frozenset({"generate", "verify"})
+
+@lru_cache(maxsize=1024)
+def _extract_placeholders(text: str) -> FrozenSet[str]:
+    """
+    Returns the names of the placeholders in a text, memoized because the same
+    prompt templates are scanned for every entry and every variation.
+    """
+    return frozenset(PLACEHOLDER_PATTERN.findall(text))
+
 class PlaceholderDict(dict):
     """
     A custom dictionary that returns the placeholder itself if a key is not found.
@@ -30,24 +48,45 @@ class PipelineService:
     and storing their results. It integrates parsing, generation, and verification services.
     """
 
-    def __init__(self, generation_model_name: str, verify_model_name: str):
+    def __init__(self,
+                 generation_model_name: str,
+                 verify_model_name: str,
+                 generate_service: GenerateService = None,
+                 verifier_service: VerifierService = None):
         """
         Initializes the PipelineService with parsing, generation, and verification services.
 
         Args:
-            model_name: The name of the language model to be used for text generation.
+            generation_model_name: The name of the language model used for text generation.
+            verify_model_name: The name of the language model used for verification.
+            generate_service: Optional already-loaded generation service to reuse.
+            verifier_service: Optional already-loaded verifier service to reuse.
+
+        Each instance keeps its own run state; by default the models come from
+        `get_generate_service`, so instances for the same models share them.
         """
         self.parse_service = ParseService()
-        self.generate_service = GenerateService(generation_model_name)
-        
-        if generation_model_name == verify_model_name:
+
+        if generate_service:
+            self.generate_service = generate_service
+        else:
+            self.generate_service = get_generate_service(generation_model_name)
+
+        if verifier_service:
+            self.verifier_service = verifier_service
+        elif generation_model_name == verify_model_name:
             self.verifier_service = VerifierService(generate_service = self.generate_service)
         else:
             self.verifier_service = VerifierService(model_name = verify_model_name)
 
-        self.results: List[Optional[Tuple[str, List[Any]]]] = []  # Stores results of each step: (step_type, list_of_results)
         self.global_references: Dict[str, str] = {}  # Global references usable across all steps
-        
+        self._reset_run_state()
+
+    def _reset_run_state(self) -> None:
+        """
+        Clears the state accumulated by a pipeline run, keeping the loaded services.
+        """
+        self.results: List[Optional[Tuple[str, List[Any]]]] = []  # Stores results of each step: (step_type, list_of_results)
         self.confirmed_references = []
         self.to_verify_references = []
 
@@ -58,9 +97,7 @@ class PipelineService:
         Args:
             steps: A list of PipelineStep objects defining the pipeline's steps.
         """
-        self.results = []  # Clear previous results
-        self.confirmed_references = []
-        self.to_verify_references = []
+        self._reset_run_state()  # Clear previous results
         try:
             for step_number, step in enumerate(steps):
                 self._validate_step_references(step, step_number)
@@ -68,9 +105,172 @@ class PipelineService:
                 self._store_result(step_number, step.type, step_result)
 
         except Exception as e:
-            logger.error(f"Pipeline execution failed at step {step_number}: {str(e)}")
+            logger.error("Pipeline execution failed at step %d: %s", step_number, e)
             raise
 
+    def run_pipeline_batch(self, requests: List[PipelineRequest]) -> List[Optional[PipelineResponse]]:
+        """
+        Executes several independent pipelines in lockstep, batching their LLM calls.
+
+        All requests must share the same step layout (type and parameters other
+        than prompt text). Steps run one position at a time across every request;
+        generate and verify steps send the prompts of all requests to the model
+        together. Consecutive steps that do not reference each other form a
+        layer and run concurrently (see _step_layers), although their model calls
+        still take turns on the shared GenerateService. A request whose pipeline
+        fails is dropped from the remaining steps and reported as None, without
+        affecting the others.
+
+        Args:
+            requests: Pipeline requests, each with its own steps and global references.
+
+        Returns:
+            A PipelineResponse (or None on failure) per request, in input order.
+        """
+        runs = [self._create_run(request.global_references or {}) for request in requests]
+        failed = [False] * len(requests)
+        num_steps = len(requests[0].steps) if requests else 0
+
+        if any(len(request.steps) != num_steps for request in requests):
+            raise ValueError("All requests in a pipeline batch must have the same number of steps.")
+
+        for layer in self._step_layers(requests[0].steps if requests else []):
+            if len(layer) == 1:
+                layer_results = [self._run_batch_step(requests, runs, failed, layer[0])]
+            else:
+                # Steps of a layer never read each other's results, so they run at
+                # the same time; GenerateService serializes their model calls, so
+                # only parsing and prompt building overlap with generation
+                with ThreadPoolExecutor(max_workers=len(layer)) as executor:
+                    layer_results = list(executor.map(
+                        lambda step_number: self._run_batch_step(requests, runs, failed, step_number),
+                        layer
+                    ))
+
+            # Results are stored in step order once the whole layer has finished
+            for step_number, step_results in zip(layer, layer_results):
+                for run, step, step_result in step_results:
+                    run._store_result(step_number, step.type, step_result)
+
+        return [
+            None if failed[index] else PipelineResponse(
+                step_results=run.get_results(),
+                verification_references={
+                    'confirmed': run.confirmed_references,
+                    'to_verify': run.to_verify_references
+                }
+            )
+            for index, run in enumerate(runs)
+        ]
+
+    @staticmethod
+    def _step_layers(steps: List[PipelineStep]) -> List[List[int]]:
+        """
+        Splits consecutive steps into layers of steps that do not depend on each other.
+
+        A step opens a new layer when it reads the results of a step in the
+        current layer; otherwise it joins it. Layers keep the step order, so
+        running them one after another satisfies every reference.
+
+        Args:
+            steps: The steps of the pipeline, in order.
+
+        Returns:
+            The step numbers of each layer, in execution order.
+        """
+        layers: List[List[int]] = []
+        layer_start = 0
+        for step_number, step in enumerate(steps):
+            if not layers or any(ref_index >= layer_start for ref_index in step.reference_step_numbers or ()):
+                layers.append([])
+                layer_start = step_number
+            layers[-1].append(step_number)
+        return layers
+
+    def _run_batch_step(
+        self,
+        requests: List[PipelineRequest],
+        runs: List['PipelineService'],
+        failed: List[bool],
+        step_number: int
+    ) -> List[Tuple['PipelineService', PipelineStep, List[Any]]]:
+        """
+        Executes one step for every run of a pipeline batch that has not failed.
+
+        Runs whose references are missing get an empty result. Runs that fail
+        validation or whose step raises are marked in `failed`. When the batched
+        call raises, each run is retried on its own so that a single bad run
+        does not fail the rest of the batch.
+
+        Args:
+            requests: Pipeline requests of the batch.
+            runs: The run service of each request.
+            failed: Failure flag of each request, updated in place.
+            step_number: The index of the step to execute.
+
+        Returns:
+            (run_service, step, step_result) for every run to store a result for.
+        """
+        step_type = requests[0].steps[step_number].type
+        step_results: List[Tuple['PipelineService', PipelineStep, List[Any]]] = []
+        pending: List[int] = []
+        for index, (run, request) in enumerate(zip(runs, requests)):
+            if failed[index]:
+                continue
+            step = request.steps[step_number]
+            try:
+                run._validate_step_references(step, step_number)
+            except ValueError as e:
+                logger.error("Pipeline %d failed at step %d: %s", index, step_number, e)
+                failed[index] = True
+                continue
+
+            if step.uses_reference and not run._validate_references(step.reference_step_numbers, step_number):
+                step_results.append((run, step, []))
+            else:
+                pending.append(index)
+
+        batch = [(runs[index], requests[index].steps[step_number]) for index in pending]
+        # PipelineStep rejects unknown types, so every step has a handler
+        handler = self._STEP_HANDLERS[step_type]
+        try:
+            results = handler(self, batch, step_number)
+        except Exception as e:
+            if len(batch) == 1:
+                logger.error("Pipeline %d failed at step %d: %s", pending[0], step_number, e)
+                failed[pending[0]] = True
+                return step_results
+            logger.warning("Pipeline batch failed at step %d, retrying each run on its own: %s", step_number, e)
+            for index, (run, step) in zip(pending, batch):
+                try:
+                    result = handler(self, [(run, step)], step_number)[0]
+                except Exception as run_error:
+                    logger.error("Pipeline %d failed at step %d: %s", index, step_number, run_error)
+                    failed[index] = True
+                    continue
+                step_results.append((run, step, result))
+            return step_results
+
+        step_results.extend((run, step, result) for (run, step), result in zip(batch, results))
+        return step_results
+
+    def _create_run(self, global_references: Dict[str, str]) -> 'PipelineService':
+        """
+        Creates a PipelineService with fresh run state that shares this instance's models.
+
+        Args:
+            global_references: Global references for the new run.
+
+        Returns:
+            A PipelineService ready to execute one pipeline run.
+        """
+        # A shallow copy shares the parse, generation and verification services
+        # without going through the constructor for every run
+        run = copy.copy(self)
+        run._reset_run_state()
+        run.global_references = global_references
+        return run
+
     def get_results(self) -> List[Dict]:
         """
         Returns the accumulated results of all executed steps.
@@ -78,18 +278,14 @@ class PipelineService:
 
         # Convert results to a serializable format
         serializable_results = []
-        for result in self.results:
-            step_type, step_data = result
-                
-            # Convertimos los datos del paso a una lista de diccionarios
-            step_data_dicts = [
-                item.to_dict() if hasattr(item, 'to_dict')
-                else (item.verification_summary.to_dict() if step_type == 'verify' and hasattr(item, 'verification_summary')
-                      else (item.parse_result.to_list_of_dicts() if step_type == 'parse' and hasattr(item, 'parse_result')
-                            else (item.to_dict() if hasattr(item, 'to_dict') else item)
-                           ))
-                for item in step_data
-            ]
+        for step_type, step_data in self.results:
+            # Every item of a step has the same type, so the conversion is chosen
+            # once per step: generation results and verification summaries become
+            # dictionaries, parse results are kept as they are
+            if step_type in SERIALIZABLE_STEP_TYPES:
+                step_data_dicts = [item.to_dict() for item in step_data]
+            else:
+                step_data_dicts = list(step_data)
 
             serializable_results.append({
                 "step_type": step_type,
@@ -132,15 +328,7 @@ class PipelineService:
         if step.uses_reference and not self._validate_references(step.reference_step_numbers, step_number):
             return []
         
-        if step.type == "generate":
-            return self._execute_generate(step, step_number)
-        elif step.type == "parse":
-            return self._execute_parse(step, step_number)
-        elif step.type == "verify":
-            return self._execute_verify(step, step_number)
-        else:
-            logger.warning(f"Unknown step type: {step.type}")
-            return []
+        return self._STEP_HANDLERS[step.type](self, [(self, step)], step_number)[0]
 
     def _store_result(self, step_number: int, step_type: str, step_result: List[Any]) -> None:
         """
@@ -160,6 +348,16 @@ class PipelineService:
             _, existing_results = self.results[step_number]
             existing_results.extend(step_result)
 
+        if step_type == "verify":
+            # Capturar referencias según estado
+            for summary in step_result:
+                if summary.reference_data is None:
+                    continue
+                if summary.final_status == "confirmed":
+                    self.confirmed_references.append(summary.reference_data)
+                elif summary.final_status == "review":
+                    self.to_verify_references.append(summary.reference_data)
+
     def _validate_references(self, reference_step_numbers: List[int], current_step_number: int) -> bool:
         """
         Checks if the referenced steps have valid results and are before the current step.
@@ -176,131 +374,139 @@ class PipelineService:
                 return False
         return True
 
-    def _execute_generate(self, step: PipelineStep, step_number: int) -> List[GeneratedResult]:
+    def _execute_generate_batch(
+        self,
+        runs: List[Tuple['PipelineService', PipelineStep]],
+        step_number: int
+    ) -> List[List[GeneratedResult]]:
         """
-        Executes a 'generate' step, handling prompt variations based on references.
+        Executes a 'generate' step for several pipeline runs with batched LLM calls.
+
+        The prompt variations of every run are collected first and sent to the
+        model together, grouped by generation parameters.
 
         Args:
-            step: The PipelineStep object for the generate step.
+            runs: (run_service, step) pairs, one per pipeline run.
             step_number: The index of the current step.
 
         Returns:
-            A list of GeneratedResult objects.
-        """
-        request: GenerateTextRequest = step.parameters
-
-        reference_data = self._get_reference_data(step.reference_step_numbers, step_number)
-
-        prompt_variations = self._create_prompt_variations(request, reference_data)
-
-        all_results = []
-        for system_prompt, user_prompt, reference_dict in prompt_variations:
-            results = self.generate_service.generate(
-                system_prompt=system_prompt,
-                user_prompt=user_prompt,
-                num_sequences=request.num_sequences,
-                max_tokens=request.max_tokens,
-                temperature=request.temperature
+            A list of GeneratedResult lists, one per run, in the order of `runs`.
+        """
+        # Group prompts by generation parameters: (params) -> [(run_index, system, user, reference_dict)]
+        groups: Dict[Tuple[int, int, float], List[Tuple[int, str, str, Dict[str, str]]]] = {}
+        for run_index, (run, step) in enumerate(runs):
+            request: GenerateTextRequest = step.parameters
+            reference_data = run._get_reference_data(step.reference_step_numbers, step_number)
+            key = (request.num_sequences, request.max_tokens, request.temperature)
+            for system_prompt, user_prompt, reference_dict in run._create_prompt_variations(request, reference_data):
+                groups.setdefault(key, []).append((run_index, system_prompt, user_prompt, reference_dict))
+
+        all_results: List[List[GeneratedResult]] = [[] for _ in runs]
+        for (num_sequences, max_tokens, temperature), prompts in groups.items():
+            results_per_prompt = self.generate_service.generate_batch(
+                [(system_prompt, user_prompt) for _, system_prompt, user_prompt, _ in prompts],
+                num_sequences=num_sequences,
+                max_tokens=max_tokens,
+                temperature=temperature
             )
-            for result in results:
-                result.reference_data = reference_dict
-            all_results.extend(results)
+            for (run_index, _, _, reference_dict), results in zip(prompts, results_per_prompt):
+                for result in results:
+                    result.reference_data = reference_dict
+                all_results[run_index].extend(results)
 
         return all_results
 
-    def _execute_parse(self, step: PipelineStep, step_number: int) -> List[ParseResult]:
+    def _execute_parse_batch(
+        self,
+        runs: List[Tuple['PipelineService', PipelineStep]],
+        step_number: int
+    ) -> List[List[ParseResult]]:
         """
-        Executes a 'parse' step.
+        Executes a 'parse' step for several pipeline runs.
+
+        The texts to parse (the step text, or the content of every referenced
+        generation) are collected for all runs before any parsing happens.
 
         Args:
-            step: The PipelineStep object for the parse step.
+            runs: (run_service, step) pairs, one per pipeline run.
             step_number: The index of the current step.
 
         Returns:
-            A list containing the ParseResult.
-        """
-        request: ParseRequest = step.parameters
-        
-        if not step.uses_reference:
-            parse_result = self.parse_service.parse_text(
-                text=request.text,
-                rules=request.rules
-            )
-
-            filtered_parse_result = self.parse_service.filter_entries(
-                parse_result=parse_result,
-                filter_type=request.output_filter,
-                n=request.output_limit,
-                rules=request.rules
-            )
-
-            return [filtered_parse_result]
-    
-        reference_data = self._get_reference_data(step.reference_step_numbers, step_number)
-        
-        parse_results = []
-        for _, step_type, step_results in reference_data: 
-            if step_type == "generate":
-                generated_result: GeneratedResult
-                for generated_result in step_results:
-                    text = generated_result.content
-                    parse_result = self.parse_service.parse_text(
-                        text=text,
-                        rules=request.rules
-                    )
-
-                    filtered_parse_result = self.parse_service.filter_entries(
-                        parse_result=parse_result,
-                        filter_type=request.output_filter,
-                        n=request.output_limit,
-                        rules=request.rules
-                    )
-                    parse_results.append(filtered_parse_result)
-
-        return parse_results
-
+            A list of ParseResult lists, one per run, in the order of `runs`.
+        """
+        texts_per_run: List[List[str]] = []
+        for run, step in runs:
+            if not step.uses_reference:
+                texts_per_run.append([step.parameters.text])
+                continue
+
+            reference_data = run._get_reference_data(step.reference_step_numbers, step_number)
+            texts_per_run.append([
+                generated_result.content
+                for _, step_type, step_results in reference_data
+                if step_type == "generate"
+                for generated_result in step_results
+            ])
+
+        # Runs sharing rules and filter are parsed together, so large batches of
+        # texts can be spread over the parse service's worker processes
+        groups: Dict[Tuple[Any, ...], List[int]] = {}
+        for run_index, (_, step) in enumerate(runs):
+            request: ParseRequest = step.parameters
+            key = (tuple(request.rules), request.output_filter, request.output_limit)
+            groups.setdefault(key, []).append(run_index)
+
+        all_results: List[List[ParseResult]] = [[] for _ in runs]
+        for (rules, output_filter, output_limit), run_indices in groups.items():
+            parsed = iter(self.parse_service.parse_texts(
+                [text for run_index in run_indices for text in texts_per_run[run_index]],
+                list(rules),
+                output_filter,
+                output_limit
+            ))
+            for run_index in run_indices:
+                all_results[run_index] = [next(parsed) for _ in texts_per_run[run_index]]
+        return all_results
 
-    def _execute_verify(self, step: PipelineStep, step_number: int) -> List[VerificationSummary]:
+    def _execute_verify_batch(
+        self,
+        runs: List[Tuple['PipelineService', PipelineStep]],
+        step_number: int
+    ) -> List[List[VerificationSummary]]:
         """
-        Executes a 'verify' step, handling method variations based on references.
+        Executes a 'verify' step for several pipeline runs with batched LLM calls.
 
         Args:
-            step: The PipelineStep object for the verify step.
+            runs: (run_service, step) pairs, one per pipeline run.
             step_number: The index of the current step.
 
         Returns:
-            A list of VerificationSummary objects.
-        """
-        request: VerifyRequest = step.parameters
-
-        if not step.uses_reference:
-            verification_summary = self.verifier_service.verify(
-                methods=request.methods,
-                required_for_confirmed=request.required_for_confirmed,
-                required_for_review=request.required_for_review
-            )
-            return [verification_summary]
-
-        reference_data = self._get_reference_data(step.reference_step_numbers, step_number)
-
-        verify_requests_variations = self._create_methods_variations(request, reference_data)
+            A list of VerificationSummary lists, one per run, in the order of `runs`.
+        """
+        verify_requests: List[VerifyRequest] = []
+        owners: List[Tuple[int, Optional[Dict[str, str]]]] = []
+        for run_index, (run, step) in enumerate(runs):
+            request: VerifyRequest = step.parameters
+
+            if not step.uses_reference:
+                verify_requests.append(request)
+                owners.append((run_index, None))
+                continue
+
+            reference_data = run._get_reference_data(step.reference_step_numbers, step_number)
+            for verify_request, reference_dict in run._create_methods_variations(request, reference_data):
+                verify_requests.append(verify_request)
+                owners.append((run_index, reference_dict))
+
+        summaries = self.verifier_service.verify_batch(verify_requests)
+
+        all_results: List[List[VerificationSummary]] = [[] for _ in runs]
+        for (run_index, reference_dict), result in zip(owners, summaries):
+            all_results[run_index].append(result)
+            if reference_dict is not None:
+                # The references are captured by status when the result is stored
+                result.reference_data = reference_dict
 
-        all_results = []
-        for verify_request, reference_dict in verify_requests_variations:
-            result = self.verifier_service.verify(
-                methods=verify_request.methods,
-                required_for_confirmed=verify_request.required_for_confirmed,
-                required_for_review=verify_request.required_for_review
-            )
-            result.reference_data = reference_dict
-            all_results.append(result)
-        
-            # Capturar referencias según estado
-            if result.final_status == "confirmed":
-                self.confirmed_references.append(reference_dict)
-            elif result.final_status == "review":
-                self.to_verify_references.append(reference_dict)
-        
         return all_results
     
     def _create_methods_variations(
@@ -513,19 +719,26 @@ class PipelineService:
         return variations
 
     def _process_placeholders(self, system_prompt, user_prompt, references: Dict[str, str], reference_dict) -> Tuple[str, str, Dict[str, str]]:
-        new_system_prompt = system_prompt
-        new_user_prompt = user_prompt
-
-        for reference_key, reference_value in references.items():
-            new_system_prompt, replaced_flag_sys = self._replace_placeholders(new_system_prompt, {reference_key: reference_value})
-            new_user_prompt, replaced_flag_usr = self._replace_placeholders(new_user_prompt, {reference_key: reference_value})
-
-            if replaced_flag_sys or replaced_flag_usr:
-                reference_dict[reference_key] = reference_value
+        # Keep only the references either prompt uses; the placeholder scan is
+        # memoized, so it only runs again after a prompt changes
+        system_placeholders = self._has_placeholders(system_prompt)
+        user_placeholders = self._has_placeholders(user_prompt)
+        if not system_placeholders and not user_placeholders:
+            return system_prompt, user_prompt, reference_dict
+
+        referenced = system_placeholders | user_placeholders
+        matched = {key: value for key, value in references.items() if key in referenced}
+        if not matched:
+            return system_prompt, user_prompt, reference_dict
+
+        # A single format_map pass per prompt fills every matched placeholder at once
+        new_system_prompt, _ = self._replace_placeholders(system_prompt, matched)
+        new_user_prompt, _ = self._replace_placeholders(user_prompt, matched)
+        reference_dict.update(matched)
 
         return new_system_prompt, new_user_prompt, reference_dict
 
-    def _has_placeholders(self, text: str) -> Set[str]:
+    def _has_placeholders(self, text: str) -> FrozenSet[str]:
         """
         Checks if a text contains placeholders and returns a set of their names.
 
@@ -535,7 +748,10 @@ class PipelineService:
         Returns:
             A set of placeholders found (without braces).
         """
-        return set(re.findall(r"{([^{}]+)}", text))
+        # Texts without an opening brace skip both the regex and the cache
+        if "{" not in text:
+            return NO_PLACEHOLDERS
+        return _extract_placeholders(text)
 
     def _replace_placeholders(self, text: str, placeholders: Dict[str, str]) -> Tuple[str, bool]:
         """
@@ -577,6 +793,14 @@ class PipelineService:
                 step_type, results = self.results[ref_index]
                 reference_data.append((ref_index, step_type, results))
             else:
-                logger.warning(f"Reference {ref_index} not found or invalid for step {current_step_number}. Returning empty result.")
+                logger.warning("Reference %d not found or invalid for step %d. Returning empty result.", ref_index, current_step_number)
                 return []
-        return reference_data
\ No newline at end of file
+        return reference_data
+
+    # Batch executor of each step type; every handler takes (self, runs, step_number).
+    # Read-only, so the table cannot be changed for every service by accident
+    _STEP_HANDLERS = MappingProxyType({
+        "generate": _execute_generate_batch,
+        "parse": _execute_parse_batch,
+        "verify": _execute_verify_batch,
+    })
@@ -1,12 +1,15 @@
 # domain/services/verifier_service.py
 
 import logging
-from typing import List
+from itertools import chain, islice
+from typing import Dict, List
+from domain.model.entities.generation import GeneratedResult
 from domain.model.entities.verification import (
     VerificationMethod, VerificationMode,
-    VerificationResult, VerificationSummary, VerificationStatus
+    VerificationResult, VerificationSummary, VerificationStatus,
+    VerifyRequest
 )
-from domain.services.generate_service import GenerateService
+from domain.services.generate_service import GenerateService, get_generate_service
 
 logger = logging.getLogger(__name__)
 
@@ -19,91 +22,193 @@ class VerifierService:
         if generate_service:
             self.generate_service = generate_service
         else:
-            self.generate_service = GenerateService(model_name)
+            self.generate_service = get_generate_service(model_name)
 
     def verify(
         self,
         methods: List[VerificationMethod],
         required_for_confirmed: int,
-        required_for_review: int
+        required_for_review: int,
+        eager: bool = False
     ) -> VerificationSummary:
         """
         Verifies the provided methods. If any ELIMINATORY method fails, we discard.
         Otherwise, count cumulative successes and compare with required_for_confirmed/review.
+        With eager=True methods are generated in two rounds (see verify_batch).
         """
-        logger.info("Starting verification process in VerifierService.")
-        results: List[VerificationResult] = []
-        cumulative_passes = 0
-        final_status = None
+        return self.verify_batch([
+            VerifyRequest(
+                methods=methods,
+                required_for_confirmed=required_for_confirmed,
+                required_for_review=required_for_review
+            )
+        ], eager=eager)[0]
 
-        for method in methods:
-            logger.debug(f"Verifying method '{method.name}' in mode '{method.mode}'.")
-            result = self._verify_consensus(method)
-            results.append(result)
+    def verify_batch(self, requests: List[VerifyRequest], eager: bool = False) -> List[VerificationSummary]:
+        """
+        Verifies several independent requests, batching their LLM calls.
 
-            if not result.passed and method.mode == VerificationMode.ELIMINATORY:
-                logger.info(f"Method '{method.name}' failed in ELIMINATORY mode. Discarding.")
-                final_status = VerificationStatus.discarded()
+        Methods are evaluated position by position in configuration order: the
+        n-th method of every request still in play is generated in one batched
+        call. A request whose ELIMINATORY method fails is discarded, so none of
+        its later methods are generated.
+
+        With eager=True the methods are generated up front in two rounds of
+        calls, so latency no longer grows with the number of methods: every
+        ELIMINATORY method first, then the CUMULATIVE methods placed before each
+        request's first failed ELIMINATORY method (all of them when none
+        failed). Results after that failure are ignored, so the summaries are
+        the same.
+        """
+        logger.info("Starting verification process in VerifierService for %d request(s).", len(requests))
+        results: List[List[VerificationResult]] = [[] for _ in requests]
+        cumulative_passes = [0] * len(requests)
+        discarded = [False] * len(requests)
+
+        # Results generated up front with eager=True, by method index of each request
+        eager_results: List[Dict[int, VerificationResult]] = [{} for _ in requests]
+        if eager:
+            for mode in (VerificationMode.ELIMINATORY, VerificationMode.CUMULATIVE):
+                # Only ELIMINATORY results exist in the second round, so the
+                # first failed one bounds the CUMULATIVE methods still needed
+                pending = [
+                    (index, method_index)
+                    for index, request in enumerate(requests)
+                    for method_index, method in enumerate(
+                        request.methods[:self._first_failure(eager_results[index], len(request.methods))]
+                    )
+                    if method.mode == mode
+                ]
+                evaluated = self._verify_consensus_batch(
+                    [requests[index].methods[method_index] for index, method_index in pending]
+                )
+                for (index, method_index), result in zip(pending, evaluated):
+                    eager_results[index][method_index] = result
+
+        # Checked once per call instead of once per evaluated method
+        debug_enabled = logger.isEnabledFor(logging.DEBUG)
+        max_methods = max((len(request.methods) for request in requests), default=0)
+        for position in range(max_methods):
+            active = [
+                index for index, request in enumerate(requests)
+                if position < len(request.methods) and not discarded[index]
+            ]
+            if not active:
                 break
-            elif result.passed and method.mode == VerificationMode.ELIMINATORY:
-                cumulative_passes += 1
-            
-            if result.passed and method.mode == VerificationMode.CUMULATIVE:
-                cumulative_passes += 1
-
-        else:  # Only executes if no break occurred in the for-loop
-            if cumulative_passes >= required_for_confirmed:
+
+            methods = [requests[index].methods[position] for index in active]
+            if eager:
+                position_results = [eager_results[index][position] for index in active]
+            else:
+                position_results = self._verify_consensus_batch(methods)
+            for index, method, result in zip(active, methods, position_results):
+                if debug_enabled:
+                    logger.debug("Verified method '%s' in mode '%s'.", method.name, method.mode)
+                results[index].append(result)
+
+                if not result.passed and method.mode == VerificationMode.ELIMINATORY:
+                    logger.info("Method '%s' failed in ELIMINATORY mode. Discarding.", method.name)
+                    discarded[index] = True
+                elif result.passed:
+                    cumulative_passes[index] += 1
+
+        summaries = []
+        for index, request in enumerate(requests):
+            if discarded[index]:
+                final_status = VerificationStatus.discarded()
+            elif cumulative_passes[index] >= request.required_for_confirmed:
                 final_status = VerificationStatus.confirmed()
-            elif cumulative_passes >= required_for_review:
+            elif cumulative_passes[index] >= request.required_for_review:
                 final_status = VerificationStatus.review()
             else:
                 final_status = VerificationStatus.discarded()
-        
-        if not final_status:
-            final_status = VerificationStatus.discarded()
-
-        logger.info(f"Verification results concluded with status '{final_status.status}'.")
-        return VerificationSummary(
-            results=results,
-            final_status=final_status.status
+
+            logger.info("Verification results concluded with status '%s'.", final_status.status)
+            summaries.append(VerificationSummary(
+                results=results[index],
+                final_status=final_status.status
+            ))
+        return summaries
+
+    @staticmethod
+    def _first_failure(results: Dict[int, VerificationResult], num_methods: int) -> int:
+        """
+        Returns the index of the first failed method among results, or num_methods if none failed.
+        """
+        return min(
+            (method_index for method_index, result in results.items() if not result.passed),
+            default=num_methods
         )
-    
-    def _verify_consensus(self, method: VerificationMethod) -> VerificationResult:
+
+    def _verify_consensus_batch(self, methods: List[VerificationMethod]) -> List[VerificationResult]:
         """
-        Conduct a 'consensus' check: LLM generates multiple sequences; 
-        we count how many responses match a valid_responses list.
+        Conduct 'consensus' checks: LLM generates multiple sequences per method;
+        we count how many responses match each method's valid_responses list.
+        All methods share a single batched LLM call. Each sequence stops as soon
+        as it contains a valid response, since later tokens cannot change
+        whether it counts.
         """
-        logger.debug(f"Consensus verification for method '{method.name}'.")
+        for method in methods:
+            self._validate_consensus_method(method)
+        if not methods:
+            return []
+
+        if len({method.num_sequences for method in methods}) == 1:
+            # Same number of sequences everywhere: one row per method, expanded by the model
+            num_sequences = methods[0].num_sequences
+            logger.debug("Generating %d sequence(s) for %d verification method(s).", num_sequences, len(methods))
+            responses_per_method = self.generate_service.generate_batch(
+                [(method.system_prompt, method.user_prompt) for method in methods],
+                num_sequences=num_sequences,
+                max_tokens=10,
+                stop_texts=[method.valid_responses for method in methods]
+            )
+        else:
+            # Mixed sequence counts: repeat each prompt once per requested sequence
+            # and sample one sequence per row, so one padded batch serves every method
+            row_methods = [method for method in methods for _ in range(method.num_sequences)]
+            rows = [(method.system_prompt, method.user_prompt) for method in row_methods]
+            logger.debug("Generating %d row(s) for %d verification method(s).", len(rows), len(methods))
+            responses = iter(chain.from_iterable(
+                self.generate_service.generate_batch(
+                    rows,
+                    num_sequences=1,
+                    max_tokens=10,
+                    stop_texts=[method.valid_responses for method in row_methods]
+                )
+            ))
+            responses_per_method = [list(islice(responses, method.num_sequences)) for method in methods]
+
+        return [
+            self._build_consensus_result(method, responses)
+            for method, responses in zip(methods, responses_per_method)
+        ]
+
+    def _validate_consensus_method(self, method: VerificationMethod) -> None:
+        """Ensures a method is fully configured for consensus verification."""
+        logger.debug("Consensus verification for method '%s'.", method.name)
+        # Failures are logged by whoever handles the ValueError
         if not method.valid_responses:
-            logger.error("Valid responses not defined for consensus verification.")
             raise ValueError("Consensus verification requires valid responses")
         if method.required_matches is None:
-            logger.error("required_matches not set for consensus verification.")
             raise ValueError("Consensus verification requires 'required_matches' to be set.")
         if method.num_sequences < method.required_matches:
-            logger.error("num_sequences is smaller than required_matches.")
             raise ValueError("num_sequences must be >= required_matches for consensus verification.")
 
-        system_prompt = method.system_prompt
-        user_prompt = method.user_prompt
-
-        logger.debug(f"Generating {method.num_sequences} sequence(s) for verification method '{method.name}'.")
-        responses = self.generate_service.generate(
-            system_prompt=system_prompt,
-            user_prompt=user_prompt,
-            num_sequences=method.num_sequences,
-            max_tokens=10 
-        )
-
+    def _build_consensus_result(self, method: VerificationMethod, responses: List[GeneratedResult]) -> VerificationResult:
+        """Counts the responses matching valid_responses and packages the outcome."""
         generated_responses = [response.content for response in responses]
 
+        # Lower each valid response and each generated content once, not once per pair
+        valid_responses = [vr.lower() for vr in method.valid_responses]
+        normalized_contents = (content.strip().lower() for content in generated_responses)
         positive_responses = sum(
-            1 for r in responses
-            if any(vr.lower() in r.content.strip().lower() for vr in method.valid_responses)
+            1 for content in normalized_contents
+            if any(vr in content for vr in valid_responses)
         )
         passed = positive_responses >= method.required_matches
 
-        logger.debug(f"Method '{method.name}' => {positive_responses}/{len(responses)} positive responses. Passed={passed}")
+        logger.debug("Method '%s' => %d/%d positive responses. Passed=%s", method.name, positive_responses, len(responses), passed)
         return VerificationResult(
             method=method,
             passed=passed,
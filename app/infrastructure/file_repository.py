@@ -3,7 +3,12 @@
 import json
 import os
 from datetime import datetime
-from typing import Any, Union
+from typing import Any, Iterable, Optional, Union
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the standard library encoder
+    orjson = None
 
 class FileRepository:
     """
@@ -13,6 +18,22 @@ class FileRepository:
     and appending data to existing files.
     """
 
+    WRITE_BUFFER_SIZE = 1 << 20
+
+    # Options bringing orjson's output close to json.dump(..., indent=2, default=str):
+    # datetimes and dataclasses go through the default callback as strings, and
+    # int, float, bool and None keys become strings. Known differences remain:
+    # NaN and infinities are written as null (json writes NaN/Infinity), ints
+    # beyond 64 bits raise TypeError, Enum members are written as their value
+    # (json writes str(member)), large floats use 1e16 instead of 1e+16, and
+    # date/datetime keys are accepted (json raises TypeError)
+    ORJSON_OPTIONS = (
+        orjson.OPT_INDENT_2
+        | orjson.OPT_NON_STR_KEYS
+        | orjson.OPT_PASSTHROUGH_DATETIME
+        | orjson.OPT_PASSTHROUGH_DATACLASS
+    ) if orjson else 0
+
     @staticmethod
     def save(data: dict, output_dir: str, filename_prefix: str) -> str:
         """
@@ -29,20 +50,106 @@ class FileRepository:
         Example:
             save(data, "results", "experiment") -> "results/experiment_20230101_123456.json"
         """
+        filepath = FileRepository._timestamped_path(output_dir, filename_prefix, "json")
+        FileRepository._write_json(filepath, data)
+        return filepath
+
+    @staticmethod
+    def _write_json(filepath: str, data: Any) -> None:
+        """
+        Writes data as an indented JSON document, replacing the file's content.
+        
+        Args:
+            filepath: Full path of the file to write
+            data: Data to save (any JSON-serializable type)
+        """
+        if orjson:
+            # C encoder serializes the whole payload to UTF-8 bytes in one call
+            with open(filepath, 'wb', buffering=FileRepository.WRITE_BUFFER_SIZE) as f:
+                f.write(orjson.dumps(data, default=str, option=FileRepository.ORJSON_OPTIONS))
+        else:
+            with open(filepath, 'w', buffering=FileRepository.WRITE_BUFFER_SIZE) as f:
+                json.dump(data, f, indent=2, default=str, ensure_ascii=False)
+    
+    @staticmethod
+    def _timestamped_path(output_dir: str, filename_prefix: str, extension: str) -> str:
+        """
+        Builds a timestamped file path, creating the directory if needed.
+        
+        Args:
+            output_dir: Target directory for the file
+            filename_prefix: Base name for the file (timestamp will be added)
+            extension: File extension without the leading dot
+            
+        Returns:
+            str: Full path of the file
+        """
         os.makedirs(output_dir, exist_ok=True)
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"{filename_prefix}_{timestamp}.json"
+        return os.path.join(output_dir, f"{filename_prefix}_{timestamp}.{extension}")
+
+    @staticmethod
+    def _encode_line(record: Any) -> bytes:
+        """
+        Encodes a record as a single newline-terminated JSON line.
+        
+        Args:
+            record: Data to encode (any JSON-serializable type)
+            
+        Returns:
+            bytes: UTF-8 encoded JSON line
+        """
+        if orjson:
+            return orjson.dumps(record, default=str, option=FileRepository.ORJSON_OPTIONS & ~orjson.OPT_INDENT_2) + b"\n"
+        return json.dumps(record, default=str, ensure_ascii=False).encode("utf-8") + b"\n"
+
+    @staticmethod
+    def append_lines(records: Iterable[Any], output_dir: str, filename: str) -> str:
+        """
+        Appends records to a newline-delimited JSON file, one record per line.
+        
+        Unlike append, existing content is never read back or rewritten, so
+        the cost only depends on the records being added.
+        
+        Args:
+            records: Data to append (any JSON-serializable items)
+            output_dir: Target directory for the file
+            filename: Exact filename to use (no timestamp)
+            
+        Returns:
+            str: Full path to the modified file
+        """
+        os.makedirs(output_dir, exist_ok=True)
         filepath = os.path.join(output_dir, filename)
         
-        with open(filepath, 'w') as f:
-            json.dump(data, f, indent=2, default=str, ensure_ascii=False)
+        with open(filepath, 'ab', buffering=FileRepository.WRITE_BUFFER_SIZE) as f:
+            for record in records:
+                f.write(FileRepository._encode_line(record))
             
         return filepath
-    
+
     @staticmethod
     def append(data: Any, output_dir: str, filename: str) -> str:
         """
-        Appends data to an existing JSON file or creates a new one.
+        Appends data as a single element of an existing JSON file or creates a new one.
+        
+        Args:
+            data: Data to append (any JSON-serializable type)
+            output_dir: Target directory for the file
+            filename: Exact filename to use (no timestamp)
+            
+        Returns:
+            str: Full path to the modified file
+        """
+        return FileRepository.extend([data], output_dir, filename)
+
+    @staticmethod
+    def extend(records: Iterable[Any], output_dir: str, filename: str) -> str:
+        """
+        Appends records, one element each, to an existing JSON file or creates a new one.
+        
+        The file is read and rewritten once for all records, giving the same
+        content as calling append once per record.
         
         Handles:
         - Creating directories if needed
@@ -51,7 +158,7 @@ class FileRepository:
         - Maintaining JSON integrity
         
         Args:
-            data: Data to append (any JSON-serializable type)
+            records: Data to append (any JSON-serializable items)
             output_dir: Target directory for the file
             filename: Exact filename to use (no timestamp)
             
@@ -66,9 +173,10 @@ class FileRepository:
         
         existing_data = []
         if os.path.exists(filepath):
-            with open(filepath, 'r') as f:
+            with open(filepath, 'rb', buffering=FileRepository.WRITE_BUFFER_SIZE) as f:
                 try:
-                    existing_data = json.load(f)
+                    # orjson.JSONDecodeError subclasses json.JSONDecodeError
+                    existing_data = orjson.loads(f.read()) if orjson else json.load(f)
                 except json.JSONDecodeError:
                     existing_data = []
 
@@ -76,10 +184,66 @@ class FileRepository:
         if not isinstance(existing_data, list):
             existing_data = [existing_data]
             
-        existing_data.append(data)
+        existing_data.extend(records)
         
         # Atomic write operation
-        with open(filepath, 'w') as f:
-            json.dump(existing_data, f, indent=2, default=str, ensure_ascii=False)
+        FileRepository._write_json(filepath, existing_data)
             
-        return filepath
\ No newline at end of file
+        return filepath
+
+
+class JsonLinesWriter:
+    """
+    Writes records one per line to a timestamped newline-delimited JSON file.
+    
+    The file is only created when the first record arrives, and the buffer is
+    flushed every `flush_every` records so an interrupted run keeps the
+    records written so far.
+    
+    Example:
+        with JsonLinesWriter("results", "cases") as writer:
+            writer.write({"id": 1})  # -> "results/cases_20230101_123456.ndjson"
+    """
+
+    def __init__(self, output_dir: str, filename_prefix: str, flush_every: int = 100):
+        """
+        Args:
+            output_dir: Target directory for the file
+            filename_prefix: Base name for the file (timestamp will be added)
+            flush_every: Number of records written between flushes
+        """
+        self.output_dir = output_dir
+        self.filename_prefix = filename_prefix
+        self.flush_every = flush_every
+        self.filepath: Optional[str] = None
+        self.count = 0
+        self._file = None
+
+    def write(self, record: Any) -> None:
+        """
+        Appends a record as a single JSON line.
+        
+        Args:
+            record: Data to write (any JSON-serializable type)
+        """
+        if self._file is None:
+            self.filepath = FileRepository._timestamped_path(self.output_dir, self.filename_prefix, "ndjson")
+            self._file = open(self.filepath, 'ab', buffering=FileRepository.WRITE_BUFFER_SIZE)
+
+        self._file.write(FileRepository._encode_line(record))
+
+        self.count += 1
+        if self.count % self.flush_every == 0:
+            self._file.flush()
+
+    def close(self) -> None:
+        """Flushes and closes the file, if one was created."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self) -> "JsonLinesWriter":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
@@ -1,10 +1,22 @@
 import argparse
 import json
 import logging
-from typing import Dict, Any, List, Callable
+import sys
+from itertools import chain
+from typing import Dict, Any, Iterator, List, Callable
+
+try:
+    import ijson
+except ImportError:  # Optional: entries are then loaded in one go
+    ijson = None
+
+try:
+    import orjson
+except ImportError:  # Optional: files and output are then handled by the standard library
+    orjson = None
 
 from domain.model.entities.benchmark import BenchmarkConfig, BenchmarkEntry, BenchmarkMetrics
-from infrastructure.file_repository import FileRepository
+from infrastructure.file_repository import FileRepository, JsonLinesWriter
 
 # Basic logging configuration
 logging.basicConfig(
@@ -45,11 +57,45 @@ CommandHandler = Callable[[argparse.Namespace], None]
 class CommandProcessor:
     """Base class for command processing with common utilities"""
     
+    # Read buffer size for JSON input files
+    READ_BUFFER_SIZE = 1 << 20
+
     @staticmethod
     def load_json_file(file_path: str) -> Dict[str, Any]:
         """Loads a JSON file and returns a dictionary."""
-        with open(file_path, "r", encoding="utf-8") as f:
-            return json.load(f)
+        with open(file_path, "rb", buffering=CommandProcessor.READ_BUFFER_SIZE) as f:
+            return orjson.loads(f.read()) if orjson else json.load(f)
+
+    @staticmethod
+    def iter_json_items(file_path: str) -> Iterator[Any]:
+        """
+        Returns an iterator over the items of a top-level JSON array.
+
+        Streams the file with ijson when it is installed, so only the current
+        item is held in memory; a first streaming pass checks the whole file,
+        so a missing or malformed file fails here, before any item has been
+        dispatched. Otherwise falls back to loading the whole array.
+
+        Raises:
+            Exception: If the file cannot be read or is not valid JSON, after
+                       logging the error
+        """
+        try:
+            if ijson is None:
+                return iter(CommandProcessor.load_json_file(file_path))
+            with open(file_path, "rb", buffering=CommandProcessor.READ_BUFFER_SIZE) as f:
+                for _ in ijson.items(f, "item", use_float=True):
+                    pass
+        except Exception as e:
+            logger.error("Error loading %s: %s", file_path, e)
+            raise
+        return CommandProcessor._stream_json_items(file_path)
+
+    @staticmethod
+    def _stream_json_items(file_path: str) -> Iterator[Any]:
+        """Yields the items of a top-level JSON array already checked by iter_json_items."""
+        with open(file_path, "rb", buffering=CommandProcessor.READ_BUFFER_SIZE) as f:
+            yield from ijson.items(f, "item", use_float=True)
 
     @staticmethod
     def parse_rules(rules_data: List[Dict]) -> List[ParseRule]:
@@ -116,6 +162,22 @@ class CommandProcessor:
 class OutputFormatter:
     """Class for formatting different types of outputs"""
     
+    @staticmethod
+    def print_json(data: Any):
+        """
+        Prints data as indented JSON, encoded in C by orjson when it is installed.
+
+        Both encoders get the options FileRepository writes files with, so the
+        output matches its files (see FileRepository.ORJSON_OPTIONS for the few
+        values orjson encodes differently from json).
+        """
+        if orjson:
+            sys.stdout.write(
+                orjson.dumps(data, default=str, option=FileRepository.ORJSON_OPTIONS).decode("utf-8") + "\n"
+            )
+        else:
+            print(json.dumps(data, indent=2, default=str, ensure_ascii=False))
+
     @staticmethod
     def print_pipeline_results(response: PipelineResponse):
         """Prints pipeline results in a readable format."""
@@ -183,18 +245,28 @@ class OutputFormatter:
 
     @staticmethod
     def print_benchmark_results(metrics: BenchmarkMetrics):
-        print("\n=== Benchmark Results ===")
-        print(f"• Accuracy: {metrics.accuracy:.2%}")
-        print(f"• Precision: {metrics.precision:.2%}")
-        print(f"• Recall: {metrics.recall:.2%}")
-        print(f"• F1-Score: {metrics.f1_score:.2%}")
-        print("\nConfusion Matrix:")
-        print(f"True Positives: {metrics.confusion_matrix['true_positive']}")
-        print(f"False Positives: {metrics.confusion_matrix['false_positive']}")
-        print(f"True Negatives: {metrics.confusion_matrix['true_negative']}")
-        print(f"False Negatives: {metrics.confusion_matrix['false_negative']}")
-        print(f"Total cases evaluated: {len(metrics.misclassified) + metrics.confusion_matrix['true_positive'] + metrics.confusion_matrix['false_positive'] + metrics.confusion_matrix['true_negative']}")
-        print(f"\nMisclassified cases saved in: misclassified_*.json")
+        confusion_matrix = metrics.confusion_matrix
+        true_positive = confusion_matrix['true_positive']
+        false_positive = confusion_matrix['false_positive']
+        true_negative = confusion_matrix['true_negative']
+        false_negative = confusion_matrix['false_negative']
+        total = true_positive + false_positive + true_negative + false_negative
+
+        # Build the whole report first and emit it with a single write
+        sys.stdout.write(
+            "\n=== Benchmark Results ===\n"
+            f"• Accuracy: {metrics.accuracy:.2%}\n"
+            f"• Precision: {metrics.precision:.2%}\n"
+            f"• Recall: {metrics.recall:.2%}\n"
+            f"• F1-Score: {metrics.f1_score:.2%}\n"
+            "\nConfusion Matrix:\n"
+            f"True Positives: {true_positive}\n"
+            f"False Positives: {false_positive}\n"
+            f"True Negatives: {true_negative}\n"
+            f"False Negatives: {false_negative}\n"
+            f"Total cases evaluated: {total}\n"
+            "\nMisclassified cases saved in: misclassified_*.ndjson\n"
+        )
 
 def setup_arg_parser() -> argparse.ArgumentParser:
     """Sets up the command-line argument parser."""
@@ -267,6 +339,17 @@ def setup_pipeline_parser(parser: argparse.ArgumentParser):
         "--pipeline-verify-model-name", 
         default="Qwen/Qwen2.5-1.5B-Instruct"
     )
+    parser.add_argument("--batch-size", type=int, default=16,
+                      help="Number of reference entries sharing each batched LLM call")
+    parser.add_argument("--concurrency", type=int, default=8,
+                      help="Maximum number of reference entry batches processed at the same time "
+                           "(their model calls run one at a time on the shared model)")
+    parser.add_argument("--result-cache", action="store_true",
+                      help="Reuse the results of the first run of duplicate reference entries instead of "
+                           "running them again (duplicates then share one sampled result)")
+    parser.add_argument("--output-format", choices=["json", "jsonl"], default="json",
+                      help="Write results as JSON lists once the run ends (json), or as JSON lines "
+                           "appended as each batch of entries finishes (jsonl)")
 
 def setup_benchmark_parser(parser: argparse.ArgumentParser):
     """Sets up the parser for the benchmark command"""
@@ -276,6 +359,13 @@ def setup_benchmark_parser(parser: argparse.ArgumentParser):
     parser.add_argument("--entries",
                       default="config/benchmark/benchmark_entries.json",
                       help="Path to the benchmark entries file")
+    parser.add_argument("--concurrency", type=int, default=8,
+                      help="Maximum number of benchmark batches processed at the same time "
+                           "(model calls of threads sharing a model run one at a time)")
+    parser.add_argument("--use-processes", action="store_true",
+                      help="Run benchmark entries in worker processes, each loading its own model")
+    parser.add_argument("--batch-size", type=int, default=16,
+                      help="Number of benchmark entries sharing each batched LLM call")
 
 def handle_generate(args: argparse.Namespace):
     """Handler for the generate command"""
@@ -294,7 +384,7 @@ def handle_generate(args: argparse.Namespace):
         "generation_time": response.generation_time,
         "model_name": response.model_name
     }
-    print(json.dumps(result, indent=2))
+    OutputFormatter.print_json(result)
 
 def handle_parse(args: argparse.Namespace):
     """Handler for the parse command"""
@@ -309,7 +399,7 @@ def handle_parse(args: argparse.Namespace):
         output_limit=args.output_limit
     ))
     
-    print(json.dumps(response.parse_result.to_list_of_dicts(), indent=2))
+    OutputFormatter.print_json(response.parse_result.to_list_of_dicts())
 
 def handle_verify(args: argparse.Namespace):
     """Handler for the verify command"""
@@ -323,7 +413,7 @@ def handle_verify(args: argparse.Namespace):
         required_for_review=args.required_review
     ))
     
-    print(json.dumps({
+    OutputFormatter.print_json({
         "final_status": response.verification_summary.final_status,
         "success_rate": response.success_rate,
         "execution_time": response.execution_time,
@@ -335,7 +425,7 @@ def handle_verify(args: argparse.Namespace):
             "timestamp": r.timestamp.isoformat(),
             "details": r.details
         } for r in response.verification_summary.results]
-    }, indent=2))
+    })
 
 def handle_pipeline(args: argparse.Namespace):
     """Handler for the pipeline command"""
@@ -343,41 +433,59 @@ def handle_pipeline(args: argparse.Namespace):
     pipeline_steps = CommandProcessor.parse_pipeline_steps(config)
     
     reference_data_path = "config/pipeline/pipeline_reference_data.json"
-    try:
-        with open(reference_data_path, 'r') as f:
-            reference_entries = json.load(f)
-    except Exception as e:
-        logger.error(f"Error loading reference data: {str(e)}")
-        raise
+    # Entries are streamed from the file as the pipeline consumes them
+    reference_entries = CommandProcessor.iter_json_items(reference_data_path)
     
+    def save_chunk(responses: List[PipelineResponse]):
+        """Appends a finished chunk's results, so an interrupted run keeps them"""
+        # JSON lines are appended without reading back earlier content
+        FileRepository.append_lines(
+            chain.from_iterable(response.step_results for response in responses),
+            output_dir="out/pipeline/results",
+            filename="pipeline_results.jsonl"
+        )
+        
+        for result_type in ['confirmed', 'to_verify']:
+            entries = [
+                entry for response in responses
+                for entry in response.verification_references.get(result_type, [])
+            ]
+            if entries:
+                FileRepository.append_lines(
+                    entries,
+                    output_dir=f"out/pipeline/verification/{result_type}",
+                    filename=f"{result_type}.jsonl"
+                )
+
     response = PipelineUseCase(
         args.pipeline_generation_model_name, 
         args.pipeline_verify_model_name
     ).execute_with_references(
         PipelineRequest(
             steps=pipeline_steps,
-            global_references=config.get("global_references", {})
+            global_references=config.get("global_references", {}),
+            enable_cache=args.result_cache
         ),
-        reference_entries=reference_entries  
+        reference_entries=reference_entries,
+        batch_size=args.batch_size,
+        concurrency=args.concurrency,
+        on_chunk=save_chunk if args.output_format == "jsonl" else None
     )
 
-    FileRepository.append(
-        data=response.step_results,
-        output_dir="out/pipeline/results",
-        filename="pipeline_results.json"
-    )
-    
-    for result_type in ['confirmed', 'to_verify']:
-        entries = response.verification_references.get(result_type, [])
-        if entries:
-            output_dir = f"out/pipeline/verification/{result_type}"
-            filename = f"{result_type}.json"
-            
-            for entry in entries:
-                FileRepository.append(
-                    data=entry,
-                    output_dir=output_dir,
-                    filename=filename
+    if args.output_format == "json":
+        FileRepository.append(
+            data=response.step_results,
+            output_dir="out/pipeline/results",
+            filename="pipeline_results.json"
+        )
+
+        for result_type in ['confirmed', 'to_verify']:
+            entries = response.verification_references.get(result_type, [])
+            if entries:
+                FileRepository.extend(
+                    records=entries,
+                    output_dir=f"out/pipeline/verification/{result_type}",
+                    filename=f"{result_type}.json"
                 )
 
     OutputFormatter.print_pipeline_results(response)
@@ -385,7 +493,7 @@ def handle_pipeline(args: argparse.Namespace):
 def handle_benchmark(args: argparse.Namespace):
     """Handler for the benchmark command"""
     config_data = CommandProcessor.load_json_file(args.config)
-    entries_data = CommandProcessor.load_json_file(args.entries)
+    entries_data = CommandProcessor.iter_json_items(args.entries)
     
     # Convert to entities
     benchmark_config = BenchmarkConfig(
@@ -395,16 +503,31 @@ def handle_benchmark(args: argparse.Namespace):
         label_value=config_data["label_value"]
     )
     
-    benchmark_entries = [
+    # Lazily built so entries stream through the benchmark instead of being held in memory
+    benchmark_entries = (
         BenchmarkEntry(
             input_data={k: v for k, v in entry.items() if k != benchmark_config.label_key},
             expected_label=entry.get(benchmark_config.label_key, "")
         )
         for entry in entries_data
-    ]
+    )
     
-    use_case = BenchmarkUseCase(benchmark_config.model_name)
-    metrics = use_case.run_benchmark(benchmark_config, benchmark_entries)  # Capture metrics
+    use_case = BenchmarkUseCase(
+        benchmark_config.model_name,
+        concurrency=args.concurrency,
+        use_processes=args.use_processes,
+        batch_size=args.batch_size
+    )
+    # Misclassified cases are written as they are found, one JSON object per line
+    with JsonLinesWriter(
+        output_dir="out/benchmark/misclassified",
+        filename_prefix="misclassified"
+    ) as misclassified_writer:
+        metrics = use_case.run_benchmark(
+            benchmark_config,
+            benchmark_entries,
+            on_misclassified=lambda result: misclassified_writer.write(result.to_dict())
+        )  # Capture metrics
     
     # Save results
     FileRepository.save(
@@ -413,13 +536,6 @@ def handle_benchmark(args: argparse.Namespace):
         filename_prefix="benchmark_results"
     )
     
-    if metrics.misclassified:
-        FileRepository.save(
-            [result.to_dict() for result in metrics.misclassified],
-            output_dir="out/benchmark/misclassified",
-            filename_prefix="misclassified"
-        )
-    
     OutputFormatter.print_benchmark_results(metrics)
     
 def main():
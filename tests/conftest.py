@@ -0,0 +1,7 @@
+# tests/conftest.py
+
+import os
+import sys
+
+# The application modules are imported as top-level packages (domain, application, ...)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app"))
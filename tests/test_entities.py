@@ -0,0 +1,55 @@
+# tests/test_entities.py
+
+import copy
+import pickle
+
+import pytest
+
+from domain.model.entities.generation import GeneratedResult, GenerationMetadata
+from domain.model.entities.parsing import ParseMatch, ParseResponse, ParseResult
+from domain.model.entities.pipeline import PipelineResponse
+
+
+def _generated_result() -> GeneratedResult:
+    metadata = GenerationMetadata("model", "system", "user", 0.0, 3, 0.1)
+    result = GeneratedResult(content="Sí, es correcto", metadata=metadata, reference_data={"name": "José"})
+    result.contains_reference("correcto")
+    return result
+
+
+@pytest.mark.parametrize("make", [
+    lambda: ParseMatch(rule_name="nombre", value="José"),
+    lambda: GenerationMetadata("model", "system", "user", 0.7, 3, 0.1),
+    _generated_result,
+    lambda: ParseResponse(parse_result=ParseResult(entries=[{"nombre": "José"}])),
+    lambda: PipelineResponse(step_results=[{"step_type": "parse"}], verification_references={"confirmed": []}),
+])
+@pytest.mark.parametrize("clone", [
+    copy.copy,
+    copy.deepcopy,
+    lambda entity: pickle.loads(pickle.dumps(entity)),
+], ids=["copy", "deepcopy", "pickle"])
+def test_slotted_entities_can_be_copied_and_pickled(make, clone):
+    entity = make()
+
+    cloned = clone(entity)
+
+    assert cloned == entity
+    assert cloned is not entity
+
+
+def test_copied_generated_result_keeps_metadata_and_references():
+    result = _generated_result()
+
+    cloned = copy.deepcopy(result)
+
+    assert cloned.to_dict() == result.to_dict()
+    assert cloned.reference_data is not result.reference_data
+
+
+def test_metadata_to_dict_returns_a_new_dict_each_call():
+    metadata = GenerationMetadata("model", "system", "user", 0.7, 3, 0.1)
+
+    metadata.to_dict()["model_name"] = "edited"
+
+    assert metadata.to_dict()["model_name"] == "model"